@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+
+from asset_pack import list_assets, read_asset
+
+BUNDLE_MAGIC = b'SQAC'
+BUNDLE_VERSION = 1
+# Magic, version, hash of the source files and length of the JSON index
+BUNDLE_HEADER = struct.Struct('<4sI32sI')
+
+_write_lock = threading.Lock()
+
+
+def hash_files(folder: str) -> bytes:
+    """
+    Returns a digest of the relative path and content of every file in the folder and its sub-folders,
+    read from the asset pack if there is one.
+    """
+
+    digest = hashlib.sha256()
+    for path in list_assets(folder):
+        digest.update(os.path.relpath(path, folder).replace(os.sep, '/').encode())
+        digest.update(read_asset(path))
+
+    return digest.digest()
+
+
+def read_bundle_index(path: str, sources_hash: bytes) -> tuple[dict, int] | None:
+    """
+    Read the index of a bundle written by write_bundle.
+
+    Returns the index and the position in the file of the data following it (the offsets of the index are relative
+    to it), or None if the file does not exist, is corrupted or was built from other source files.
+    """
+
+    try:
+        with open(path, 'rb') as file:
+            magic, version, bundle_hash, index_length = BUNDLE_HEADER.unpack(file.read(BUNDLE_HEADER.size))
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION or bundle_hash != sources_hash:
+                return None
+            index = json.loads(file.read(index_length))
+    except (OSError, ValueError, struct.error):
+        return None
+
+    return index, BUNDLE_HEADER.size + index_length
+
+
+def read_bundle_chunks(path: str, data_position: int, index: dict[str, list[dict]],
+                       names: list[str]) -> dict[str, memoryview] | None:
+    """
+    Read the data of the specified names of a bundle, with a single read for each name.
+
+    Returns for each name a view on its data, starting at the offset of its first entry in the index,
+    or None if the file cannot be read.
+    """
+
+    chunks: dict[str, memoryview] = dict()
+    try:
+        with open(path, 'rb') as file:
+            for name in names:
+                start = min(entry['offset'] for entry in index[name])
+                end = max(entry['offset'] + entry['length'] for entry in index[name])
+                file.seek(data_position + start)
+                chunks[name] = memoryview(file.read(end - start))
+                if len(chunks[name]) != end - start:
+                    return None
+    except OSError:
+        return None
+
+    return chunks
+
+
+def write_bundle(path: str, sources_hash: bytes, chunks: dict[str, list[tuple[dict, bytes | memoryview]]]) -> None:
+    """
+    Write the chunks in a single file, with an index giving the offset and length of each one.
+
+    Parameters
+    ----------
+    path : str
+        Path of the bundle, its folder is created if needed.
+    sources_hash : bytes
+        Digest of the files the chunks were built from, as returned by hash_files.
+    chunks : dict
+        For each name, a list of (metadata, data) tuples. The metadata are stored in the index with
+        the offset and length of the data.
+    """
+
+    index: dict[str, list[dict]] = dict()
+    data: list[bytes | memoryview] = list()
+    offset = 0
+    for name, entries in chunks.items():
+        index[name] = list()
+        for metadata, chunk in entries:
+            index[name].append({**metadata, 'offset': offset, 'length': len(chunk)})
+            data.append(chunk)
+            offset += len(chunk)
+
+    encoded_index = json.dumps(index).encode()
+    header = BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, sources_hash, len(encoded_index))
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # The bundle is written next to the previous one and then replaced, so that a crash never leaves half a file
+        with open(path + '.tmp', 'wb') as file:
+            file.write(header)
+            file.write(encoded_index)
+            file.writelines(data)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+
+
+def write_bundle_in_background(path: str, sources_hash: bytes,
+                               chunks: dict[str, list[tuple[dict, bytes | memoryview]]]) -> None:
+    """
+    Write the bundle in a new thread, see write_bundle. The chunks must not be changed afterwards.
+    """
+
+    threading.Thread(target=_write_bundle_in_order, args=(path, sources_hash, chunks)).start()
+
+
+def _write_bundle_in_order(path: str, sources_hash: bytes,
+                           chunks: dict[str, list[tuple[dict, bytes | memoryview]]]) -> None:
+    # Each save of a bundle has everything the previous ones had, so writing them in the order they were made leaves
+    # the last one on the disk
+    with _write_lock:
+        write_bundle(path, sources_hash, chunks)
+
+
+def touch_bundle(path: str) -> None:
+    """Mark the bundle as used, so that prune_bundles keeps it."""
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_bundles(folder: str, kept: int) -> None:
+    """Remove the bundles of the folder except the kept most recently written or touched ones."""
+
+    try:
+        paths = [os.path.join(folder, filename) for filename in os.listdir(folder) if not filename.endswith('.tmp')]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[kept:]:
+            os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,125 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+
+class AssetLoader:
+    """
+    A class which decodes assets in a pool of threads, and finishes them on the main thread.
+    """
+
+    def __init__(self, max_workers: int | None = None, max_queued: int | None = None):
+        """
+        Initialize the loader and its pool of threads.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of threads decoding the assets. Defaults to the number of cores.
+            If 0, the assets are decoded on the main thread during update (for the browser, which has no threads).
+        max_queued : int, optional
+            Maximum number of jobs given to the threads at once, so that decoded assets waiting to be finished
+            do not pile up in memory. Defaults to four times the number of threads.
+        """
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        self.executor: ThreadPoolExecutor | None = ThreadPoolExecutor(max_workers) if max_workers > 0 else None
+        self.max_queued: int = max_queued if max_queued is not None else 4 * max_workers
+
+        self.waiting_jobs: deque[tuple[Callable[[], Any], Callable[[Any], None]]] = deque()
+        self.running_jobs: dict[Future, Callable[[Any], None]] = dict()
+        self.finalizers: list[Callable[[], None]] = list()
+
+        self.total_count: int = 0
+        self.finished_count: int = 0  # Including the failed jobs
+        self.errors: list[Exception] = list()  # Raised by the failed jobs and finalizers
+
+    def add(self, decode: Callable[[], Any], finish: Callable[[Any], None]):
+        """
+        Add a job to the loader.
+
+        Parameters
+        ----------
+        decode : Callable
+            Function called in a thread, it should not touch the display. Its result is given to finish.
+        finish : Callable
+            Function called on the main thread with the result of decode.
+        """
+
+        self.waiting_jobs.append((decode, finish))
+        self.total_count += 1
+
+    def add_finalizer(self, callback: Callable[[], None]):
+        """Add a function called on the main thread once all the jobs are finished."""
+
+        self.finalizers.append(callback)
+
+    def __submit_jobs(self):
+        while self.waiting_jobs and len(self.running_jobs) < self.max_queued:
+            decode, finish = self.waiting_jobs.popleft()
+            self.running_jobs[self.executor.submit(decode)] = finish
+
+    def __finish(self, finish: Callable[[Any], None], get_result: Callable[[], Any]):
+        try:
+            finish(get_result())
+        except Exception as error:
+            # The asset is left out, it is loaded again when first used if it can be
+            self.errors.append(error)
+        self.finished_count += 1
+
+    def update(self, time_budget: float):
+        """
+        Finish the decoded jobs until the time budget (in seconds) is spent or all the jobs are finished.
+        The finalizers are called once there is no job left.
+        """
+
+        end_time = time.perf_counter() + time_budget
+        while self.waiting_jobs or self.running_jobs:
+            remaining_time = end_time - time.perf_counter()
+            if remaining_time <= 0:
+                if self.executor is not None:
+                    # Keeps the threads busy until the next update
+                    self.__submit_jobs()
+                return
+
+            if self.executor is None:
+                decode, finish = self.waiting_jobs.popleft()
+                self.__finish(finish, decode)
+            else:
+                self.__submit_jobs()
+                done, _ = wait(self.running_jobs, timeout=remaining_time, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.__finish(self.running_jobs.pop(future), future.result)
+
+        finalizers, self.finalizers = self.finalizers, list()
+        for finalizer in finalizers:
+            try:
+                finalizer()
+            except Exception as error:
+                self.errors.append(error)
+
+    def finish_all(self):
+        """Decode and finish all the jobs, blocking until they are done."""
+
+        while not self.is_finished():
+            self.update(1.0)
+
+    def is_finished(self) -> bool:
+        return not self.waiting_jobs and not self.running_jobs and not self.finalizers
+
+    def get_progress(self) -> float:
+        """Returns the fraction of the jobs finished, between 0 and 1."""
+
+        if self.total_count == 0:
+            return 1.0
+        return self.finished_count / self.total_count
+
+    def close(self):
+        """Stop the threads of the loader."""
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
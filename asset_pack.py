@@ -0,0 +1,201 @@
+import argparse
+import io
+import os
+import struct
+
+import pygame
+
+import constants as co
+
+PACK_MAGIC = b'SQPK'
+PACK_VERSION = 1
+# Magic, version and number of files
+PACK_HEADER = struct.Struct('<4sII')
+# Offset and length of the file in the pack, length of its path (which follows the entry)
+PACK_ENTRY = struct.Struct('<QQH')
+# Files never read by the game
+IGNORED_FILES = ('desktop.ini',)
+
+
+class PackFile(io.RawIOBase):
+    """A read-only file over a slice of the pack, which can be given to pygame instead of a file name."""
+
+    def __init__(self, data: memoryview):
+        super().__init__()
+        self.data = data
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = max(0, min(len(buffer), len(self.data) - self.position))
+        buffer[:count] = self.data[self.position:self.position + count]
+        self.position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            self.position = len(self.data) + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence}).")
+
+        self.position = max(0, self.position)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+
+class AssetPack:
+    """
+    A single file containing all the resources, with an index of the offset of each file.
+    The pack is memory-mapped, so reading a file only copies its pages when they are used.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        try:
+            import mmap
+            self.data = memoryview(mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ))
+        except (ImportError, OSError, ValueError):
+            # Platforms without mmap (such as the browser) read the whole pack instead
+            self.data = memoryview(self.file.read())
+
+        magic, version, count = PACK_HEADER.unpack_from(self.data)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"'{path}' is not an asset pack of version {PACK_VERSION}.")
+
+        self.files: dict[str, tuple[int, int]] = dict()
+        position = PACK_HEADER.size
+        for _ in range(count):
+            offset, length, path_length = PACK_ENTRY.unpack_from(self.data, position)
+            position += PACK_ENTRY.size
+            self.files[bytes(self.data[position:position + path_length]).decode()] = (offset, length)
+            position += path_length
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.files
+
+    def get_data(self, path: str) -> memoryview:
+        """Returns a view on the content of the file, without copying it."""
+
+        offset, length = self.files[path]
+        return self.data[offset:offset + length]
+
+    def open(self, path: str) -> PackFile:
+        return PackFile(self.get_data(path))
+
+    def list_files(self, folder: str) -> list[str]:
+        prefix = folder.rstrip('/') + '/'
+        return sorted(path for path in self.files if path.startswith(prefix))
+
+
+PACK: AssetPack | None = None
+_is_pack_loaded = False
+
+
+def get_pack() -> AssetPack | None:
+    """Returns the asset pack, loading it the first time. Returns None if there is no valid pack."""
+
+    global PACK, _is_pack_loaded
+
+    if not _is_pack_loaded:
+        _is_pack_loaded = True
+        try:
+            PACK = AssetPack(co.ASSET_PACK_PATH)
+        except (OSError, ValueError, struct.error):
+            PACK = None
+
+    return PACK
+
+
+def _normalize(path: str) -> str:
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def open_asset(path: str) -> io.RawIOBase | io.BufferedReader:
+    """Open a resource file from the asset pack, or from the disk if it is not in the pack."""
+
+    pack = get_pack()
+    if pack is not None and _normalize(path) in pack:
+        return pack.open(_normalize(path))
+    return open(path, 'rb')
+
+
+def read_asset(path: str) -> bytes | memoryview:
+    pack = get_pack()
+    if pack is not None and _normalize(path) in pack:
+        return pack.get_data(_normalize(path))
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def _list_files(folder: str) -> list[str]:
+    return sorted(_normalize(os.path.join(root, filename))
+                  for root, _, filenames in os.walk(folder)
+                  for filename in filenames if filename not in IGNORED_FILES)
+
+
+def list_assets(folder: str) -> list[str]:
+    """Returns the sorted paths of all the resource files in the folder and its sub-folders."""
+
+    pack = get_pack()
+    if pack is not None:
+        files = pack.list_files(_normalize(folder))
+        if files:
+            return files
+
+    return _list_files(folder)
+
+
+def load_image(path: str) -> pygame.Surface:
+    return pygame.image.load(open_asset(path), path)
+
+
+def load_sound(path: str) -> pygame.mixer.Sound:
+    return pygame.mixer.Sound(open_asset(path))
+
+
+def build_pack(resources_folder: str, pack_path: str) -> int:
+    """Write all the files of the resources folder in a pack. Returns the number of files."""
+
+    paths = _list_files(resources_folder)
+    encoded_paths = [path.encode() for path in paths]
+    offset = PACK_HEADER.size + sum(PACK_ENTRY.size + len(path) for path in encoded_paths)
+    entries = list()
+    for path, encoded_path in zip(paths, encoded_paths):
+        length = os.path.getsize(path)
+        entries.append(PACK_ENTRY.pack(offset, length, len(encoded_path)) + encoded_path)
+        offset += length
+
+    with open(pack_path, 'wb') as pack_file:
+        pack_file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(paths)))
+        pack_file.writelines(entries)
+        for path in paths:
+            with open(path, 'rb') as file:
+                pack_file.write(file.read())
+
+    return len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the asset pack read by the game instead of the loose files.")
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('--resources', default=co.RESOURCES_FOLDER, help="Folder of the resources to pack.")
+    parser.add_argument('--output', default=co.ASSET_PACK_PATH, help="Path of the pack.")
+    args = parser.parse_args()
+
+    count = build_pack(args.resources, args.output)
+    print(f"Packed {count} files from '{args.resources}' into '{args.output}'.")
+
+
+if __name__ == '__main__':
+    main()
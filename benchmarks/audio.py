@@ -0,0 +1,146 @@
+"""
+Audio benchmark: startup time of the audio (initialization of the mixer and loading of all the sounds, decoded from
+their files or read from the sound bank) and trigger-to-output latency of the sounds, for several mixer buffer sizes.
+
+Usage: python benchmarks/audio.py [--runs N] [--triggers N] [--buffers SIZE ...]
+
+Each run is a new process with the dummy SDL audio driver, which mixes a buffer at the rate of a real device. The
+latency of a sound played at any time of a frame is the wait for the next frame (at 60 fps, where
+SoundManager.update plays the sounds), measured, plus the wait for the mixer to take the sound, measured with a
+sound of a single sample, plus the duration of a buffer, while the device plays the buffer the sound was mixed into.
+The devices which queue more than one buffer add their own latency on top.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRAME_DURATION = 1 / 60
+TEST_SOUND = 'benchmark'
+
+
+def run_child(args: argparse.Namespace) -> dict:
+    os.chdir(ROOT_FOLDER)
+
+    import pygame
+
+    import sounds
+    from asset_loader import AssetLoader
+    from sound_manager import SoundManager
+
+    timings = dict()
+    start = time.perf_counter()
+    SoundManager.pre_init(args.buffer)
+    pygame.mixer.init()
+    timings['mixer_init'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sounds.set_bank_path(args.bank_path)
+    sounds.register_sounds()
+    loader = AssetLoader()
+    sounds.queue_sounds(loader)
+    loader.finish_all()
+    timings['sounds_load'] = time.perf_counter() - start
+    loader.close()
+
+    if args.triggers > 0:
+        timings.update(measure_latency(args.triggers, args.buffer))
+    return timings
+
+
+def measure_latency(triggers: int, buffer_size: int) -> dict:
+    import pygame
+
+    from sound_manager import SoundManager
+
+    frequency, size, channels = pygame.mixer.get_init()
+    buffer_duration = buffer_size / frequency
+    # A single sample, which stops playing as soon as the mixer takes it
+    SoundManager.instance().set_sound(pygame.mixer.Sound(buffer=bytes(channels * abs(size) // 8)), TEST_SOUND)
+    SoundManager.instance().options.sfx_volume = 1
+
+    frame_waits = list()
+    mix_waits = list()
+    latencies = list()
+    frames_start = time.perf_counter()
+    for _ in range(triggers):
+        # Triggered at any time of a frame, the sound is played on the update at the start of the next one
+        time.sleep(random.uniform(0, FRAME_DURATION))
+        trigger_time = time.perf_counter()
+        SoundManager.instance().play_sound(TEST_SOUND)
+        time.sleep(FRAME_DURATION - (trigger_time - frames_start) % FRAME_DURATION)
+        update_time = time.perf_counter()
+        SoundManager.instance().update()
+
+        while any(voice.is_playing() for voice in SoundManager.instance().voices):
+            time.sleep(0.0001)
+        mix_time = time.perf_counter()
+        frame_waits.append(update_time - trigger_time)
+        mix_waits.append(mix_time - update_time)
+        # The device then plays the buffer the sound was mixed into
+        latencies.append(mix_time - trigger_time + buffer_duration)
+
+    return {'frame_wait': statistics.median(frame_waits), 'mix_wait': statistics.median(mix_waits),
+            'latency': statistics.median(latencies), 'latency_p95': statistics.quantiles(latencies, n=20)[-1]}
+
+
+def run(buffer_size: int, bank_path: str, triggers: int) -> dict:
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    process = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', '--buffer', str(buffer_size),
+                              '--bank-path', bank_path, '--triggers', str(triggers)],
+                             cwd=ROOT_FOLDER, env=env, capture_output=True, text=True, timeout=300)
+    if process.returncode != 0:
+        raise RuntimeError(f'buffer of {buffer_size} failed:\n{process.stdout}\n{process.stderr}')
+
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    sys.path.insert(0, ROOT_FOLDER)
+    import constants as co
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--triggers', type=int, default=40)
+    parser.add_argument('--buffers', type=int, nargs='+', default=[128, 256, 512, 1024, 2048, 4096])
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--buffer', type=int, default=co.MIXER_BUFFER_SIZE, help=argparse.SUPPRESS)
+    parser.add_argument('--bank-path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args)), flush=True)
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        bank_path = os.path.join(folder, 'sounds.cache')
+
+        print(f'== Audio startup (buffer of {co.MIXER_BUFFER_SIZE} samples, median of {args.runs} runs)')
+        for mode in ('decoded', 'sound bank'):
+            results = list()
+            for _ in range(args.runs):
+                if mode == 'decoded' and os.path.exists(bank_path):
+                    os.remove(bank_path)
+                results.append(run(co.MIXER_BUFFER_SIZE, bank_path, 0))
+            mixer_init = statistics.median(timings['mixer_init'] for timings in results)
+            sounds_load = statistics.median(timings['sounds_load'] for timings in results)
+            print(f'{mode:>12}: mixer init {1000 * mixer_init:6.1f} ms, sounds {1000 * sounds_load:6.1f} ms')
+
+        print(f'== Trigger-to-output latency ({args.triggers} triggers at 60 fps)')
+        print(f'{"buffer":>8} {"buffer (ms)":>12} {"frame wait":>11} {"mix wait":>9} {"median":>8} {"p95":>8}')
+        for buffer_size in args.buffers:
+            timings = run(buffer_size, bank_path, args.triggers)
+            print(f'{buffer_size:>8} {1000 * buffer_size / co.MIXER_FREQUENCY:>12.1f} '
+                  f'{1000 * timings["frame_wait"]:>11.1f} {1000 * timings["mix_wait"]:>9.1f} '
+                  f'{1000 * timings["latency"]:>8.1f} '
+                  f'{1000 * timings["latency_p95"]:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
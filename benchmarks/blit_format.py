@@ -0,0 +1,70 @@
+"""
+Blit benchmark: time to blit textures to the screen as loaded from the files, and once converted to the
+pixel format of the display with display_format.convert.
+
+Usage: python benchmarks/blit_format.py [--blits N] [--width W] [--height H]
+
+Runs with the dummy SDL video driver unless another one is set, so it works without a display.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Textures drawn every frame: full screen, large and small sprites
+TEXTURES = {
+    'background': "resources/textures/background.png",
+    'play button': "resources/textures/main_menu/play_btn.png",
+    'cell 128': "resources/textures/cells/base/128.png",
+    'cell 32': "resources/textures/cells/base/32.png",
+}
+
+
+def time_blits(screen, texture, count: int) -> float:
+    """Returns the mean time of a blit in seconds."""
+
+    start = time.perf_counter()
+    for _ in range(count):
+        screen.blit(texture, (0, 0))
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--blits', type=int, default=500)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    sys.path.insert(0, ROOT_FOLDER)
+    os.chdir(ROOT_FOLDER)
+
+    import pygame
+
+    import display_format
+    from asset_pack import load_image
+
+    pygame.init()
+    screen = pygame.display.set_mode((args.width, args.height))
+    display_format.update()
+
+    print(f'== {args.blits} blits per texture on a {args.width}x{args.height} screen (us per blit)')
+    print(f'{"texture":>16} {"loaded":>10} {"converted":>10} {"speedup":>8}')
+    for name, path in TEXTURES.items():
+        loaded = load_image(path)
+        converted = display_format.convert(loaded)
+        # Warm up, the first blits can allocate blit maps
+        time_blits(screen, loaded, 5)
+        time_blits(screen, converted, 5)
+
+        loaded_time = time_blits(screen, loaded, args.blits)
+        converted_time = time_blits(screen, converted, args.blits)
+        print(f'{name:>16} {1e6 * loaded_time:10.1f} {1e6 * converted_time:10.1f} '
+              f'{loaded_time / converted_time:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Run an entry point of the game until its first screen is shown, and print the startup timings as JSON.
+Used by startup.py, see there for the usage.
+"""
+import json
+import os
+import runpy
+import sys
+import time
+
+START_TIME = time.perf_counter()
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    entry_point = sys.argv[1]
+    os.chdir(ROOT_FOLDER)
+    sys.path.insert(0, ROOT_FOLDER)
+
+    import pygame
+
+    import_time = time.perf_counter() - START_TIME
+    timings = {'entry_point': entry_point, 'pygame_import': import_time}
+
+    display_update = pygame.display.update
+
+    def update(*args):
+        display_update(*args)
+        if 'first_frame' not in timings:
+            timings['first_frame'] = time.perf_counter() - START_TIME
+
+    pygame.display.update = update
+
+    import game
+
+    on_assets_loaded = game.Game.on_assets_loaded
+
+    def on_first_screen(self):
+        on_assets_loaded(self)
+        timings['first_screen'] = time.perf_counter() - START_TIME
+        print(json.dumps(timings), flush=True)
+        os._exit(0)
+
+    game.Game.on_assets_loaded = on_first_screen
+
+    if entry_point == 'headless':
+        from window import Window
+        import constants as co
+
+        pygame.init()
+        screen = Window.create(width=co.WIDTH, height=co.HEIGHT)
+        headless_game = game.Game(screen, Window.get_scale(co.WIDTH, co.HEIGHT, screen=screen), is_browser=False)
+        headless_game.start()
+        while not headless_game.is_ended:
+            headless_game.loop()
+    else:
+        runpy.run_path(entry_point, run_name='__main__')
+
+
+if __name__ == '__main__':
+    main()
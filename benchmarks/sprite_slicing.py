@@ -0,0 +1,97 @@
+"""
+Sprite slicing benchmark: load time and memory of the cell and modifier sprite sheets,
+sliced with copies (one surface per row, then one per sprite) or with subsurface views.
+
+Usage: python benchmarks/sprite_slicing.py [--runs N] [--scale S]
+    --scale also scales every sprite as textures.py does (0 to only slice).
+
+Each mode runs in its own process, so that the peak memory of one does not hide the other.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ('copy', 'views')
+
+
+def get_peak_memory() -> int | None:
+    """Returns the peak resident memory of the process in bytes, if the platform gives it."""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(mode: str, scale: float) -> dict:
+    sys.path.insert(0, ROOT_FOLDER)
+    os.chdir(ROOT_FOLDER)
+
+    import pygame
+    from pygame.transform import scale_by
+
+    import textures
+    from images import Image
+
+    pygame.init()
+    # Reads the files once, so that every mode starts with them in the disk cache
+    sprite_sheets = textures._get_sprite_sheets()
+    for filename, _ in sprite_sheets:
+        pygame.image.load(filename)
+
+    memory_before = get_peak_memory()
+    start = time.perf_counter()
+    sprites = list()
+    for filename, size in sprite_sheets:
+        sliced = Image.slice_horizontally_then_vertically(filename, size, size, views=mode == 'views')
+        sprites.append([scale_by(sprite, scale) for sprite in sliced] if scale > 0 else sliced)
+    duration = time.perf_counter() - start
+    memory_after = get_peak_memory()
+
+    return {
+        'duration': duration,
+        'sprites': sum(len(group) for group in sprites),
+        'peak_memory_increase': None if memory_before is None else memory_after - memory_before
+    }
+
+
+def run(mode: str, scale: float) -> dict:
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    process = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', mode, '--scale', str(scale)],
+                             env=env, capture_output=True, text=True, timeout=120)
+    if process.returncode != 0:
+        raise RuntimeError(f'{mode} failed:\n{process.stdout}\n{process.stderr}')
+
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=0)
+    parser.add_argument('--measure', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure is not None:
+        print(json.dumps(measure(args.measure, args.scale)))
+        return
+
+    for mode in MODES:
+        results = [run(mode, args.scale) for _ in range(args.runs)]
+        print(f'== {mode} ({results[0]["sprites"]} sprites, {args.runs} runs)')
+        print(f'{"load and slice":>24}: {1000 * statistics.median(result["duration"] for result in results):8.1f} ms')
+        if results[0]['peak_memory_increase'] is not None:
+            memory = statistics.median(result['peak_memory_increase'] for result in results)
+            print(f'{"peak memory increase":>24}: {memory / 2 ** 20:8.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Startup benchmark: import time of the game modules (from python -X importtime) and time to the first frame
+and to the first screen, for main.py (browser), main_pyi.py (desktop) and the headless path (game only).
+
+Usage: python benchmarks/startup.py [--runs N] [--cold]
+    --cold removes the texture cache before each run.
+
+Runs with the dummy SDL video and audio drivers, so it works without a display.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_FRAME_SCRIPT = os.path.join(ROOT_FOLDER, 'benchmarks', 'first_frame.py')
+ENTRY_POINTS = ('main.py', 'main_pyi.py', 'headless')
+GAME_MODULES = ('game', 'textures', 'sounds', 'level', 'levels', 'utils', 'window', 'asset_loader', 'asset_cache')
+
+
+def parse_import_times(stderr: str) -> dict[str, int]:
+    """Returns the cumulative import time (us) of each module from the output of -X importtime."""
+
+    times = dict()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def run(entry_point: str, cold: bool) -> tuple[dict, dict[str, int]]:
+    if cold:
+        shutil.rmtree(os.path.join(ROOT_FOLDER, 'cache', 'textures'), ignore_errors=True)
+
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    process = subprocess.run([sys.executable, '-X', 'importtime', FIRST_FRAME_SCRIPT, entry_point],
+                             cwd=ROOT_FOLDER, env=env, capture_output=True, text=True, timeout=120)
+    if process.returncode != 0:
+        raise RuntimeError(f'{entry_point} failed:\n{process.stdout}\n{process.stderr}')
+
+    return json.loads(process.stdout.strip().splitlines()[-1]), parse_import_times(process.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--cold', action='store_true')
+    args = parser.parse_args()
+
+    for entry_point in ENTRY_POINTS:
+        results = [run(entry_point, args.cold) for _ in range(args.runs)]
+        print(f'== {entry_point} ({args.runs} runs, {"cold" if args.cold else "warm"} cache)')
+        for key in ('pygame_import', 'first_frame', 'first_screen'):
+            print(f'{key:>24}: {1000 * statistics.median(timings[key] for timings, _ in results):8.1f} ms')
+        print('  import time (cumulative, median):')
+        for module in GAME_MODULES:
+            values = [import_times[module] for _, import_times in results if module in import_times]
+            if values:
+                print(f'{module:>24}: {statistics.median(values) / 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
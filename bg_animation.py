@@ -5,46 +5,109 @@ import textures
 from window import Scale
 import pygame as pyg
 import constants as co
+from constants import QualityStep
+from quality import GOVERNOR
 
 
 class BackgroundAnimation:
+    """
+    Cells fading in and out in the background. They come from a fixed pool and are placed on a grid of slots, the
+    free slots outside of the excluded rect being kept up to date so that spawning a cell allocates nothing.
+    """
+
     def __init__(self, scale: Scale):
-        self.cells: list[BackgroundCell] = list()
+        self.cells: list[BackgroundCell] = [BackgroundCell() for _ in range(co.BG_CELL_COUNT)]
+        self.alive_count: int = 0
+        self.scale = scale
+        self.slots: list[tuple[int, int]] = [
+            (co.BG_CELL_SIZE * i, co.BG_CELL_SIZE * j + co.BG_CELL_OFFSET_Y)
+            for i in range(co.WIDTH // co.BG_CELL_SIZE) for j in range(co.WIDTH // co.BG_CELL_SIZE)
+        ]
+        # Slots outside of the excluded rect without a living cell, and the excluded rect they were computed for
+        self.free_slots: list[tuple[int, int]] = list(self.slots)
+        self.excl_rect: pyg.Rect | None = None
+        # Texture of the cells with its alpha multiplied by each step of the fade, and the texture it was made from
+        self.alpha_ramp: list[pyg.Surface] = list()
+        self.ramp_source: pyg.Surface | None = None
+
+    def set_scale(self, scale: Scale):
         self.scale = scale
 
-    def draw(self, screen: pyg.Surface, excl_rect: pyg.Rect | None, dt: float):
-        if len(self.cells) < 35:
-            x = co.BG_CELL_SIZE * random.randrange(co.WIDTH // co.BG_CELL_SIZE)
-            y = co.BG_CELL_SIZE * random.randrange(co.WIDTH // co.BG_CELL_SIZE) + co.BG_CELL_OFFSET_Y
-            if excl_rect is None or not excl_rect.colliderect(pyg.Rect(x, y, co.BG_CELL_SIZE, co.BG_CELL_SIZE)):
-                self.cells.append(BackgroundCell(x, y, self.scale))
+    def set_excl_rect(self, excl_rect: pyg.Rect | None):
+        self.excl_rect = None if excl_rect is None else pyg.Rect(excl_rect)
+        occupied_slots = {cell.slot for cell in self.cells if cell.is_alive()}
+        self.free_slots = [slot for slot in self.slots if slot not in occupied_slots and not self.is_excluded(slot)]
+
+    def is_excluded(self, slot: tuple[int, int]) -> bool:
+        return self.excl_rect is not None and self.excl_rect.colliderect(
+            pyg.Rect(slot[0], slot[1], co.BG_CELL_SIZE, co.BG_CELL_SIZE))
+
+    def update_alpha_ramp(self):
+        self.ramp_source = textures.BG_CELL
+        self.alpha_ramp = list()
+        for step in range(co.BG_CELL_ALPHA_STEPS + 1):
+            texture = self.ramp_source.copy()
+            alpha = round(co.BG_CELL_MAX_ALPHA * step / co.BG_CELL_ALPHA_STEPS)
+            texture.fill((255, 255, 255, alpha), special_flags=pyg.BLEND_RGBA_MULT)
+            self.alpha_ramp.append(texture)
+
+    def spawn(self):
+        # Removed by swapping with the last slot, so that it does not shift the list
+        index = random.randrange(len(self.free_slots))
+        self.free_slots[index], self.free_slots[-1] = self.free_slots[-1], self.free_slots[index]
+        slot = self.free_slots.pop()
+        for cell in self.cells:
+            if not cell.is_alive():
+                cell.spawn(slot)
+                self.alive_count += 1
+                return
+
+    def update(self, dt: float, excl_rect: pyg.Rect | None):
+        """Spawn and fade the cells, outside of the excluded rect. dt is the simulation step (s)."""
+
+        if excl_rect != self.excl_rect:
+            self.set_excl_rect(excl_rect)
+
+        max_count = co.BG_CELL_COUNT if GOVERNOR.is_enabled(QualityStep.BACKGROUND_CELLS) else co.BG_CELL_REDUCED_COUNT
+        if self.alive_count < max_count and self.free_slots:
+            self.spawn()
 
-        for i in range(len(self.cells) - 1, -1, -1):
-            cell = self.cells[i]
-            if cell.lifetime <= 0:
-                self.cells.pop(i)
-            else:
-                cell.draw(screen, dt)
+        for cell in self.cells:
+            if not cell.is_alive():
+                continue
+
+            cell.update(dt)
+            if not cell.is_alive():
+                self.alive_count -= 1
+                if not self.is_excluded(cell.slot):
+                    self.free_slots.append(cell.slot)
+
+    def draw(self, screen: pyg.Surface):
+        if textures.BG_CELL is not self.ramp_source:
+            self.update_alpha_ramp()
+
+        for cell in self.cells:
+            if cell.is_alive() and cell.alpha >= 5:
+                step = round(cell.alpha / co.BG_CELL_MAX_ALPHA * co.BG_CELL_ALPHA_STEPS)
+                screen.blit(self.alpha_ramp[step], self.scale.to_screen_pos(*cell.slot))
 
 
 class BackgroundCell:
-    def __init__(self, x: int, y: int, scale: Scale):
-        self.x = x
-        self.y = y
+    def __init__(self):
+        self.slot: tuple[int, int] = (0, 0)
         self.alpha: int = 0
-        self.scale = scale
-        self.texture = textures.BG_CELL.copy()
+        self.initial_lifetime: float = 1
+        self.lifetime: float = 0
+
+    def is_alive(self) -> bool:
+        return self.lifetime > 0
+
+    def spawn(self, slot: tuple[int, int]):
+        self.slot = slot
         self.initial_lifetime = random.random() * (
                 co.BG_CELL_MAX_LIFETIME - co.BG_CELL_MIN_LIFETIME) + co.BG_CELL_MIN_LIFETIME
-        self.lifetime: float = self.initial_lifetime
+        self.lifetime = self.initial_lifetime
 
-    def draw(self, screen: pyg.Surface, dt: float):
+    def update(self, dt: float):
         self.lifetime -= dt
         self.alpha = int(co.BG_CELL_MAX_ALPHA * math.sin(self.lifetime * math.pi / self.initial_lifetime))
-
-        self.texture.set_alpha(self.alpha)
-
-        if self.alpha < 5:
-            return
-
-        screen.blit(self.texture, self.scale.to_screen_pos(self.x, self.y))
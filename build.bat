@@ -5,15 +5,16 @@ set PROJECT_FOLDER=Squale
 set PROJECT_NAME=Squale
 set RESOURCES_FOLDER=resources
 set ICON_PATH=%RESOURCES_FOLDER%/icon.ico
+set ASSET_PACK=resources.pack
 
 if "%~1"=="--debug" (
 	echo Debug
 ) else (
 	:: PY-INSTALLER
 	pyinstaller --onefile -i %ICON_PATH% -n %PROJECT_NAME% %PYI_MAIN%
-	xcopy %RESOURCES_FOLDER% dist\%RESOURCES_FOLDER%\ /e /s /y
+	python asset_pack.py build --resources %RESOURCES_FOLDER% --output dist\%ASSET_PACK%
 	cd dist
-	tar.exe -c -a -f %PROJECT_NAME%.zip %RESOURCES_FOLDER% %PROJECT_NAME%.exe
+	tar.exe -c -a -f %PROJECT_NAME%.zip %ASSET_PACK% %PROJECT_NAME%.exe
 	cd ..
 )
 
@@ -0,0 +1,72 @@
+import pygame as pyg
+
+import constants as co
+from cell_animation import CellSelectAnimation
+
+try:
+    import numpy
+    from pygame import sndarray
+except ImportError:
+    # The cascades are then played cell by cell
+    numpy = None
+
+# Premixed cascades by the volumes of their cells, least recently used first
+CASCADE_CACHE: dict[tuple[float, ...], pyg.mixer.Sound] = dict()
+
+
+def can_premix() -> bool:
+    return numpy is not None
+
+
+def get_cascade(sound: pyg.mixer.Sound, volumes: list[float]) -> pyg.mixer.Sound | None:
+    """
+    Returns the sounds the cells of a circle play at the end of their select animation, mixed into a single sound
+    starting when the circle is validated. Returns None if they cannot be mixed.
+
+    Parameters
+    ----------
+    sound : pygame.mixer.Sound
+        Sound played by each cell.
+    volumes : list of float
+        Volume of the sound of each cell, in the order of their animations.
+    """
+
+    if numpy is None or not volumes:
+        return None
+
+    key = tuple(volumes)
+    cascade = CASCADE_CACHE.pop(key, None)
+    if cascade is None:
+        cascade = _mix(sound, volumes)
+        if cascade is None:
+            return None
+        if len(CASCADE_CACHE) >= co.CASCADE_CACHE_MAX_SIZE:
+            del CASCADE_CACHE[next(iter(CASCADE_CACHE))]
+    CASCADE_CACHE[key] = cascade
+    return cascade
+
+
+def _mix(sound: pyg.mixer.Sound, volumes: list[float]) -> pyg.mixer.Sound | None:
+    samples = sndarray.array(sound)
+    if not numpy.issubdtype(samples.dtype, numpy.signedinteger):
+        # The mix is only made for the integer samples the mixer uses by default
+        return None
+    frequency = pyg.mixer.get_init()[0]
+    starts = [round(CellSelectAnimation.get_end_time(len(volumes), order) * frequency)
+              for order in range(len(volumes))]
+
+    mix = numpy.zeros((starts[-1] + len(samples),) + samples.shape[1:], numpy.float32)
+    # The cells share a few volumes, by their sizes
+    scaled_samples: dict[float, numpy.ndarray] = dict()
+    for start, volume in zip(starts, volumes):
+        if volume not in scaled_samples:
+            # As the volume of a channel, which cannot be above 1
+            scaled_samples[volume] = samples.astype(numpy.float32) * min(1.0, volume)
+        mix[start:start + len(samples)] += scaled_samples[volume]
+
+    # Scaled down rather than clipped if the overlapping sounds are too loud
+    limit = numpy.iinfo(samples.dtype).max
+    peak = numpy.abs(mix).max()
+    if peak > limit:
+        mix *= limit / peak
+    return sndarray.make_sound(mix.astype(samples.dtype))
@@ -8,7 +8,9 @@ import sounds
 import textures
 import utils
 from cell_animation import CellAnimation, CellSelectAnimation, CellTempSelectAnimation, CellTouchAnimation
-from constants import CellType, CellData
+from constants import CellType, CellData, QualityStep
+from quality import GOVERNOR
+from render_queue import RenderQueue
 from screen_shake import SHAKER
 from sound_manager import SoundManager
 from window import Scale
@@ -36,10 +38,12 @@ class Cell:
         self.displayed: bool = True
         self.vector = (0.0, 0.0)
         self.velocity = (0.0, 0.0)
-        self.temp_rect: pyg.Rect = None
+        self.temp_rect: pyg.FRect | None = None  # In floats, so that the small steps of the motions add up
+        self.previous_temp_pos: tuple[float, float] | None = None  # Position of temp_rect before the last update
         self.previous_sign = 0
 
         self.flying_text: FlyingText | None = None
+        self.is_select_sound_premixed: bool = False  # Its select sound is played by the one of its circle
 
         self.affected_cells: list[Cell] = []
 
@@ -57,8 +61,9 @@ class Cell:
         self.type = new_type
         self.cell_data = constants.CELL_DATA[self.type.value]
 
-    def set_temp_rect(self, cell_size: int, x: int, y: int):
-        self.temp_rect = pyg.Rect(x, y, self.size * cell_size, self.size * cell_size)
+    def set_temp_rect(self, cell_size: int, x: float, y: float):
+        self.temp_rect = pyg.FRect(x, y, self.size * cell_size, self.size * cell_size)
+        self.previous_temp_pos = None
 
     def is_in_place(self) -> bool:
         x = self.temp_rect.centerx - self.rect.centerx
@@ -83,6 +88,9 @@ class Cell:
         if self.type == CellType.BLOCKER:
             return
 
+        if not GOVERNOR.is_enabled(QualityStep.TOUCH_ANIMATION):
+            return
+
         dir_x = self.rect.centerx - x
         dir_y = self.rect.centery - y
         mag = math.dist((0, 0), (dir_x, dir_y))
@@ -100,6 +108,7 @@ class Cell:
     def unselect(self, order: int = -1):
         self.selected = False
         self.temp_selected = False
+        self.is_select_sound_premixed = False
         self.animation = None
         self.points = 0.0
 
@@ -116,49 +125,77 @@ class Cell:
         # -1 is because there aren't modifiers for sizes 16 and 32
         return textures.MODIFIERS_TEXTURES[self.cell_data.modifier_texture][self.texture_size - 2].get_current_sprite()
 
-    def draw(self, surface: pyg.Surface, x_offset: int, y_offset: int, scale: Scale, dt: float):
+    def update(self, dt: float):
         if not self.displayed:
             return
 
-        rect = self.rect if self.temp_rect is None else self.temp_rect
-
         if self.animation is not None:
             self.animation.update(dt)
-
-            anim_scale = self.animation.get_scale()
-            if anim_scale != 1:
-                x_offset += rect.w * (1 - anim_scale) / 2
-                y_offset += rect.h * (1 - anim_scale) / 2
-
-            anim_dx, anim_dy = self.animation.get_displacement()
-
             if self.animation.is_finished:
                 if self.animation.get_type() == constants.CELL_SELECT_ANIMATION and self.selected:
                     if self.points > 0:
                         SHAKER.shake(int(1 + self.points))
                     self.on_select(self)
                     self.flying_text = FlyingText(int(self.points), self.rect)
-                    SoundManager.instance().play_sound(sounds.CELL_SELECT, volume=0.5 + (self.texture_size + 1) / 10)
+                    if not self.is_select_sound_premixed:
+                        SoundManager.instance().play_sound(sounds.CELL_SELECT, volume=self.get_select_volume())
 
                 self.animation = None
+
+        if self.flying_text is not None:
+            self.flying_text.update(dt)
+            if self.flying_text.lifetime <= 0:
+                self.flying_text = None
+
+    def get_select_volume(self) -> float:
+        return 0.5 + (self.texture_size + 1) / 10
+
+    def move_temp_rect(self, dx: float, dy: float):
+        self.previous_temp_pos = self.temp_rect.topleft
+        self.temp_rect.x += dx
+        self.temp_rect.y += dy
+
+    def draw(self, queue: RenderQueue, x_offset: int, y_offset: int, scale: Scale, alpha: float):
+        """
+        Queue the textures of the cell.
+
+        Parameters
+        ----------
+        alpha : float
+            Progress from the previous update to the next one, to interpolate the position of the moving cells.
+        """
+
+        if not self.displayed:
+            return
+
+        rect = self.rect if self.temp_rect is None else self.temp_rect
+        x, y = rect.topleft
+        if self.temp_rect is not None and self.previous_temp_pos is not None:
+            x = utils.lerp(self.previous_temp_pos[0], x, alpha)
+            y = utils.lerp(self.previous_temp_pos[1], y, alpha)
+
+        if self.animation is not None:
+            anim_scale = self.animation.get_scale()
+            if anim_scale != 1:
+                x_offset += rect.w * (1 - anim_scale) / 2
+                y_offset += rect.h * (1 - anim_scale) / 2
+
+            anim_dx, anim_dy = self.animation.get_displacement()
         else:
             anim_scale = 1.0
             anim_dx, anim_dy = 0.0, 0.0
 
         total_scale = scale.scale * anim_scale
-        surface.blit(pyg.transform.scale(self.__get_main_texture(), (rect.w * total_scale, rect.h * total_scale)),
-                     scale.to_screen_pos(rect.x + x_offset + anim_dx, rect.y + y_offset + anim_dy))
+        screen_pos = scale.to_screen_pos(x + x_offset + anim_dx, y + y_offset + anim_dy)
+        queue.add(pyg.transform.scale(self.__get_main_texture(), (rect.w * total_scale, rect.h * total_scale)),
+                  screen_pos, constants.CELL_LAYER)
 
         if self.cell_data.modifier_texture >= 0 and self.real_size in constants.VALID_MULTIPLIER_SIZES:
-            surface.blit(
-                pyg.transform.scale(self.__get_modifier_texture(), (rect.w * total_scale, rect.h * total_scale)),
-                scale.to_screen_pos(rect.x + x_offset + anim_dx, rect.y + y_offset + anim_dy))
+            queue.add(pyg.transform.scale(self.__get_modifier_texture(), (rect.w * total_scale, rect.h * total_scale)),
+                      screen_pos, constants.MODIFIER_LAYER)
 
         if self.flying_text is not None:
-            self.flying_text.draw(surface, x_offset, y_offset, scale, dt)
-
-            if self.flying_text.lifetime <= 0:
-                self.flying_text = None
+            self.flying_text.draw(queue, x_offset, y_offset, scale, alpha)
 
     def contains_point(self, x: int, y: int):
         return self.rect.collidepoint(x, y)
@@ -175,19 +212,23 @@ class FlyingText:
         self.text: str = f'+{value:.0f}'
         self.x: float = cell_rect.centerx
         self.y: float = cell_rect.top
+        self.previous_y: float = self.y
         self.lifetime: float = 1
 
-    def draw(self, screen: pyg.Surface, x_offset: int, y_offset: int, scale: Scale, dt: float):
+    def update(self, dt: float):
+        self.previous_y = self.y
         self.lifetime -= dt
         self.y -= 10 * dt
 
-        font = utils.get_font(24)
-        text = font.render(self.text, False, constants.DARK_COLOR)
-        text_white = font.render(self.text, False, constants.LIGHT_COLOR)
-        x = self.x - text.get_width() / 2 + x_offset
-        y = self.y - text.get_width() / 2 + y_offset
-        for dx in (-2, 0, 2):
-            for dy in (-2, 0, 2):
-                screen.blit(text_white, scale.to_screen_pos(x + dx, y + dy))
-
-        screen.blit(text, scale.to_screen_pos(x, y))
+    def draw(self, queue: RenderQueue, x_offset: int, y_offset: int, scale: Scale, alpha: float):
+        atlas = utils.get_glyph_atlas(24, constants.DARK_COLOR)
+        x = self.x - atlas.get_width(self.text) / 2 + x_offset
+        y = utils.lerp(self.previous_y, self.y, alpha) - atlas.get_width(self.text) / 2 + y_offset
+        if GOVERNOR.is_enabled(QualityStep.FLYING_TEXT_OUTLINE):
+            white_atlas = utils.get_glyph_atlas(24, constants.LIGHT_COLOR)
+            for dx in (-2, 0, 2):
+                for dy in (-2, 0, 2):
+                    white_atlas.queue(queue, self.text, scale.to_screen_pos(x + dx, y + dy),
+                                      constants.FLYING_TEXT_LAYER)
+
+        atlas.queue(queue, self.text, scale.to_screen_pos(x, y), constants.FLYING_TEXT_LAYER)
@@ -9,13 +9,19 @@ class CellAnimation:
     NO_DISPLACEMENT = (0, 0)
 
     def __init__(self, total: int, order: int, phases: list[int]):
-        factor = 15 if total < 10 else max(1.5, 15 - total / 2)
-        self.frame = -factor * order
+        self.frame = -CellAnimation.get_delay(total, order)
         self.phases = phases
         self.phase = 0
 
         self.is_finished = False
 
+    @staticmethod
+    def get_delay(total: int, order: int) -> float:
+        """Returns the delay of the animation of a cell after the first one, out of the total animated (frames)."""
+
+        factor = 15 if total < 10 else max(1.5, 15 - total / 2)
+        return factor * order
+
     def get_scale(self) -> float:
         return 1.0
 
@@ -36,8 +42,16 @@ class CellAnimation:
 
 
 class CellSelectAnimation(CellAnimation):
+    PHASES = [0, 15, 22]
+
     def __init__(self, total: int, order: int):
-        super().__init__(total, order, [0, 15, 22])
+        super().__init__(total, order, CellSelectAnimation.PHASES)
+
+    @staticmethod
+    def get_end_time(total: int, order: int) -> float:
+        """Returns the time from the start of the animation of the cell to its end (s)."""
+
+        return (CellAnimation.get_delay(total, order) + CellSelectAnimation.PHASES[-1]) / 60
 
     def get_scale(self) -> float:
         if self.phase == 0:
@@ -1,30 +1,88 @@
 import pygame as pyg
 
 import constants
+import display_format
 import textures
+import utils
 import constants as co
+from render_queue import RenderQueue
 from window import Scale
 
+# Pre-rasterized rings by radius and width on the screen and color, the least recently used first
+RING_CACHE: dict[tuple[int, int, tuple[int, int, int]], pyg.Surface] = dict()
+# The rings were converted to the previous format of the display
+display_format.add_listener(RING_CACHE.clear)
+
+
+def get_ring(radius: int, width: int, color: tuple[int, int, int], create: bool = True) -> pyg.Surface | None:
+    """
+    Returns a surface of size 2 * radius + 2 with the ring drawn around its center, from the cache if possible.
+    Its background is transparent through a colorkey: with RLE acceleration, blitting it on an opaque surface is
+    faster than drawing the ring, which is not the case of a ring with per-pixel alpha.
+
+    Parameters
+    ----------
+    radius : int
+        Radius of the ring on the screen (px).
+    width : int
+        Width of the ring on the screen (px).
+    color : tuple of int
+        Color of the ring.
+    create : bool, default = True
+        If False, returns None instead of drawing the ring when it is not in the cache, for instance for a circle
+        whose radius changes every frame.
+    """
+
+    key = (radius, width, color)
+    ring = RING_CACHE.pop(key, None)
+    if ring is None:
+        if not create:
+            return None
+        ring = display_format.create_opaque_surface((2 * radius + 2, 2 * radius + 2))
+        ring.fill(co.RING_COLORKEY)
+        pyg.draw.circle(ring, color, (radius + 1, radius + 1), radius, width=width)
+        ring.set_colorkey(co.RING_COLORKEY, pyg.RLEACCEL)
+        if len(RING_CACHE) >= co.RING_CACHE_MAX_SIZE:
+            del RING_CACHE[next(iter(RING_CACHE))]
+    RING_CACHE[key] = ring
+    return ring
+
 
 class Circle:
     def __init__(self, x: int, y: int, radius: float):
         self.x = x
         self.y = y
         self.radius = radius
+        self.previous_radius = radius  # Before the last update, while it grows
         self.is_hovered = False
 
     def __repr__(self):
         return f'({self.x:0f} ; {self.y:.0f}) r={self.radius:.1f}'
 
-    def draw(self, surface: pyg.Surface, x_offset: int, y_offset: int, scale: Scale):
-        width = max(1, int(self.radius ** 0.5 / 2.5 * scale.scale))
+    def draw(self, surface: pyg.Surface, queue: RenderQueue, x_offset: int, y_offset: int, scale: Scale,
+             cache_ring: bool = True, alpha: float = 1.0):
+        """
+        Queue the blit of the ring on RING_LAYER. If cache_ring is False and the ring is not in the cache,
+        it is drawn directly on the surface instead, so the blits below it must have been flushed.
+        The radius is interpolated between the previous and the current one by alpha.
+        """
+
+        game_radius = utils.lerp(self.previous_radius, self.radius, alpha)
+        width = max(1, int(game_radius ** 0.5 / 2.5 * scale.scale))
         color = constants.DARK_COLOR if not self.is_hovered else constants.RED_COLOR
-        pyg.draw.circle(surface, color, scale.to_screen_pos(self.x + x_offset, self.y + y_offset),
-                        self.radius * scale.scale, width=width)
+        x, y = scale.to_screen_pos(self.x + x_offset, self.y + y_offset)
+        radius = round(game_radius * scale.scale)
+        ring = get_ring(radius, width, color, create=cache_ring)
+        if ring is None:
+            pyg.draw.circle(surface, color, (x, y), game_radius * scale.scale, width=width)
+        else:
+            # Like pyg.draw.circle, which truncates the center
+            queue.add(ring, (int(x) - radius - 1, int(y) - radius - 1), co.RING_LAYER)
         if self.is_hovered:
-            surface.blit(textures.REMOVE_CIRCLE,
-                         scale.to_screen_pos(self.x - co.REMOVE_CIRCLE_TEXTURE_SIZE / 2 / scale.scale + x_offset,
-                                             self.y - co.REMOVE_CIRCLE_TEXTURE_SIZE / 2 / scale.scale + y_offset))
+            queue.add(textures.REMOVE_CIRCLE,
+                      scale.to_screen_pos(self.x - co.REMOVE_CIRCLE_TEXTURE_SIZE / 2 / scale.scale + x_offset,
+                                          self.y - co.REMOVE_CIRCLE_TEXTURE_SIZE / 2 / scale.scale + y_offset),
+                      co.REMOVE_CIRCLE_LAYER)
 
     def contains_point(self, x: int, y: int):
         return (x - self.x) ** 2 + (y - self.y) ** 2 <= self.radius ** 2
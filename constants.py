@@ -6,6 +6,7 @@ import pygame as pyg
 
 class GameState(IntEnum):
     NONE = -9999
+    LOADING = -20
     BROWSER_WAIT_FOR_CLICK = -10
     PLAYING_LEVEL = 0
     END_OF_LEVEL = 10
@@ -21,6 +22,10 @@ N_KEY = ord('n')
 ENTER_KEY = ord('\r')
 SPACE_KEY = ord(' ')
 ESC_KEY = 27
+F3_KEY = pyg.K_F3
+F9_KEY = pyg.K_F9
+F10_KEY = pyg.K_F10
+F11_KEY = pyg.K_F11
 
 LEFT_CLICK = 1
 RIGHT_CLICK = 3
@@ -32,6 +37,8 @@ GAME_RECT = pyg.Rect(0, 0, WIDTH, HEIGHT)
 
 GAME_Y_OFFSET = 200
 CURSOR_OFFSET = 16
+WINDOWED_SIZE = (1280, 720)  # Size of the window when leaving fullscreen
+RESIZE_DELAY = 0.2  # Time the size of the window must stay the same before the textures are rescaled (s)
 
 BLACK = (0, 0, 0)
 DARK_COLOR = (20, 20, 20)
@@ -40,12 +47,72 @@ LIGHT_COLOR = (235, 235, 235)
 RED_COLOR = (200, 50, 50)
 DARK_RED_COLOR = (100, 0, 0)
 
+# Simulation
+SIMULATION_STEP = 1 / 120  # s
+MAX_SIMULATION_STEPS = 12  # Per frame, beyond this the frame is not drawn to catch up
+MAX_SKIPPED_RENDERS = 2  # Consecutive frames not drawn, beyond this the simulation is late instead
+
+# Frame pacing
+REFRESH_RATE_AUTO = 0  # Refresh rate option using the one of the display
+DEFAULT_REFRESH_RATE = 60  # If the one of the display is unknown
+PACER_MAX_SPIN_TIME = 0.002  # s, spent spinning before the start of a frame instead of sleeping
+PACER_SAMPLE_COUNT = 120
+
+# Deferred work, run in the time left at the end of the frames, lowest priority first
+DEFERRED_WORK_MARGIN = 0.002  # Time left unused before the next frame (s)
+PROFILER_FLUSH_PRIORITY = 0
+LEVEL_PREFETCH_PRIORITY = 1
+LEVEL_PREFETCH_COST = 0.002  # s
+GLYPH_ATLAS_WARM_UP_PRIORITY = 2
+GLYPH_ATLAS_WARM_UP_COST = 0.006  # s
+GLYPH_CACHE_SAVE_PRIORITY = 3  # After the warm-ups, so that their atlases are written at once
+GLYPH_CACHE_SAVE_COST = 0.0005  # s, the file is written in the background
+GARBAGE_COLLECTION_PRIORITY = 4
+GARBAGE_COLLECTION_COST = 0.010  # s
+
+# Idle throttling
+IDLE_DELAY = 1.0  # s without input nor animation before the frame rate is lowered
+IDLE_FPS = 15  # Only the ambient animations (bobbing, pulsing, background) are shown then
+
+# Render scale
+RENDER_SCALES = (1.0, 0.75, 0.5)  # Resolutions the frame is drawn at before being upscaled, relative to the screen
+RENDER_SCALE_AUTO = 0  # Render scale option picking one of RENDER_SCALES to meet the target fps
+RENDER_SCALE_OPTIONS = (RENDER_SCALE_AUTO,) + RENDER_SCALES
+RENDER_SCALE_WINDOW = 2.0  # Duration of the frames measured before changing the automatic render scale (s)
+RENDER_SCALE_DOWN_LOAD = 0.9  # Fraction of the frame budget above which the automatic render scale decreases
+RENDER_SCALE_UP_LOAD = 0.7  # Fraction of the frame budget the higher render scale should stay under to increase it
+
+
+# Quality governor
+class QualityStep(IntEnum):
+    """Effects turned off by the quality governor when the frames take too long, in this order."""
+    BACKGROUND_CELLS = 0
+    FLYING_TEXT_OUTLINE = 1
+    SCREEN_SHAKE = 2
+    PULSING_BUTTONS = 3
+    TOUCH_ANIMATION = 4
+
+
+QUALITY_WINDOW = 1.0  # Duration of the frames measured before turning an effect off or on (s)
+QUALITY_DOWN_LOAD = 0.9  # Fraction of the frame budget above which an effect is turned off
+QUALITY_UP_LOAD = 0.6  # Fraction of the frame budget under which an effect can be turned back on
+QUALITY_RESTORE_WINDOWS = 3  # Consecutive windows under QUALITY_UP_LOAD before an effect is turned back on
+
 # Background
+BG_CELL_COUNT = 35
+BG_CELL_REDUCED_COUNT = 12  # When the quality governor turns off QualityStep.BACKGROUND_CELLS
 BG_CELL_SIZE = 64
 BG_CELL_OFFSET_Y = -BG_CELL_SIZE // 2
 BG_CELL_MIN_LIFETIME = 0.7
 BG_CELL_MAX_LIFETIME = 1.5
 BG_CELL_MAX_ALPHA = 125
+BG_CELL_ALPHA_STEPS = 32  # Number of textures of the fade, from transparent to BG_CELL_MAX_ALPHA
+
+# Loading
+LOADING_TASK_TIME_SLICE = 0.012  # Time given to the background tasks, as finishing assets, each frame (s)
+TASK_TIME_SLICE = 0.003  # Same once the first screen is shown
+LOADING_BAR_RECT = pyg.Rect((WIDTH - 800) / 2, 600, 800, 40)
+LOADING_TEXT_RECT = pyg.Rect(0, 400, WIDTH, 150)
 
 # Main menu
 LOGO_SIZE = (1000, 400)
@@ -255,11 +322,76 @@ CELL_TOUCH_ANIMATION = 3
 CELL_TOUCH_ANIMATION_MIN_INTENSITY = 3
 CELL_TOUCH_ANIMATION_MAX_INTENSITY = 10
 
+# Rendering layers of the level, drawn in increasing order
+CELL_LAYER = 0
+MODIFIER_LAYER = 1
+FLYING_TEXT_LAYER = 2
+RING_LAYER = 3
+REMOVE_CIRCLE_LAYER = 4
+
+# Circles
+RING_CACHE_MAX_SIZE = 32
+RING_COLORKEY = (255, 0, 255)  # Transparent color of the cached rings, never used by the rings themselves
+
+# Pulse of the buttons and bobbing of the titles and medals
+PULSE_AMPLITUDE = 0.03
+PULSE_SPEED = 2.5  # rad/s
+PULSE_PHASE_COUNT = 48
+BOB_AMPLITUDE = 4
+BOB_SPEED = 2.5  # rad/s
+BOB_PHASE_COUNT = 64
+
+# Profiling overlay
+PROFILER_POS = (10, 1020)  # Bottom left corner
+PROFILER_TEXT_SIZE = 24
+PROFILER_LINE_HEIGHT = 26
+PROFILER_SAMPLE_COUNT = 120
+PROFILER_FLUSH_INTERVAL = 0.25  # s
+PROFILER_PACING_SAMPLE_COUNT = 600  # Frames of the jitter and missed deadlines histograms
+PROFILER_JITTER_BUCKETS = (0.25, 0.5, 1, 2, 4)  # Upper bounds (ms), the last bucket has the later frames
+
 # Screen shake
 SCREEN_SHAKE_COUNT = 3
+SCREEN_SHAKE_RATE = 60  # Values of the shake per second
 SCREEN_SHAKE_MAX_INTENSITY = 10
 FREQUENCY = 2 * math.pi / SCREEN_SHAKE_COUNT
 
+# Mixer, set before pygame.init
+MIXER_FREQUENCY = 44100
+MIXER_SAMPLE_SIZE = -16  # Signed 16 bits
+MIXER_CHANNELS = 2
+# Samples mixed at once: a sound is heard one to two buffers after it is played (of 5.8 ms at 44100 Hz), a smaller
+# buffer risks crackles on slow machines
+MIXER_BUFFER_SIZE = 256
+BROWSER_MIXER_BUFFER_SIZE = 1024  # The audio of the browser runs between the frames
+
+# Sound voices
+SOUND_CHANNEL_COUNT = 16  # Voices playing at once, a sound played beyond steals one or is dropped
+DEFAULT_SOUND_PRIORITY = 1
+DEFAULT_SOUND_MAX_VOICES = 2  # Voices playing the same sound at once, the oldest is stolen beyond
+CASCADE_CACHE_MAX_SIZE = 16  # Select sounds of the cells of a circle, mixed together
+
 # Font
 FONT_PATH = "resources/font/ldcBlackRound.ttf"
 FONT_Y_OFFSET = 1 / 16
+# Characters of the glyph atlases, for the numbers which change every frame (and the frame rate)
+GLYPH_CHARACTERS = "0123456789 +-/.,:%()fps"
+# Font sizes and colors of the atlases, rendered in advance so that the first screens using them do not stutter
+WARM_UP_GLYPH_ATLASES = (
+    (16, DARK_COLOR),  # Frame rate
+    (24, DARK_COLOR), (24, LIGHT_COLOR),  # Flying texts
+    (64, MEDIUM_COLOR), (64, DARK_RED_COLOR),  # Points and circles of the levels
+    (POINTS_TEXT_SIZE[1], DARK_COLOR), (MEDAL_TEXT_FONT_SIZE, DARK_COLOR),  # End of level
+    (EOG_GOLD_MEDAL_TEXT_SIZE, MEDIUM_COLOR),  # End of game
+)
+
+# Resources
+RESOURCES_FOLDER = "resources"
+ASSET_PACK_PATH = "resources.pack"
+TEXTURES_FOLDER = "resources/textures"
+TEXTURE_CACHE_FOLDER = "cache/textures"
+TEXTURE_CACHE_MAX_FILES = 4  # Caches of other window sizes are removed beyond this
+GLYPH_CACHE_PATH = "cache/glyphs.cache"
+SOUNDS_FOLDER = "resources/audio/sounds"
+SOUND_BANK_PATH = "cache/sounds.cache"
+KEPT_TEXTURE_SCALES = 1  # Sets of textures of previous scales kept in memory
@@ -0,0 +1,88 @@
+import warnings
+from typing import Callable
+
+import pygame
+
+_masks: tuple[int, int, int, int] | None = None  # Masks of a surface converted with convert_alpha
+_listeners: list[Callable[[], None]] = list()
+
+
+def update():
+    """
+    Read the pixel format of the display. Should be called each time the display mode is set:
+    if the format changed, the listeners are called so that they convert their surfaces again.
+    """
+
+    global _masks
+
+    previous_masks = _masks
+    _masks = None
+    if pygame.display.get_surface() is not None:
+        _masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+
+    if _masks is not None and _masks != previous_masks:
+        for listener in _listeners:
+            listener()
+
+
+def add_listener(callback: Callable[[], None]):
+    """Add a function called when the pixel format of the display changes."""
+
+    _listeners.append(callback)
+
+
+def _get_masks() -> tuple[int, int, int, int] | None:
+    if _masks is None and pygame.display.get_surface() is not None:
+        update()
+    return _masks
+
+
+def get_pixel_format() -> str | None:
+    """
+    Returns the pygame.image.tobytes format matching the pixels of a surface converted with convert_alpha,
+    or None if there is no display or the format has no name.
+    """
+
+    masks = _get_masks()
+    if masks == (0xff0000, 0xff00, 0xff, 0xff000000):
+        return 'BGRA'
+    if masks == (0xff, 0xff00, 0xff0000, 0xff000000):
+        return 'RGBA'
+    return None
+
+
+def is_converted(surface: pygame.Surface) -> bool:
+    """Returns True if the surface has the pixel format of the display, with an alpha channel."""
+
+    masks = _get_masks()
+    return masks is not None and surface.get_bitsize() == 32 and surface.get_masks() == masks
+
+
+def convert(surface: pygame.Surface) -> pygame.Surface:
+    """Returns the surface in the pixel format of the display. Does nothing if it already is or there is no display."""
+
+    if _get_masks() is None or is_converted(surface):
+        return surface
+    return surface.convert_alpha()
+
+
+def create_opaque_surface(size: tuple[int, int]) -> pygame.Surface:
+    """
+    Returns a surface without alpha channel in the pixel format of the display, or in the default format if
+    there is no display. Blits on it are faster than on a surface with an alpha channel.
+    """
+
+    surface = pygame.Surface(size)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+def check_converted(surfaces: list[pygame.Surface], name: str):
+    """Warn if some of the surfaces are not in the pixel format of the display. Only checks in debug builds."""
+
+    if __debug__ and _get_masks() is not None:
+        unconverted = sum(not is_converted(surface) for surface in surfaces)
+        if unconverted > 0:
+            warnings.warn(f"{unconverted} surface(s) of '{name}' are not converted to the display format, "
+                          f"every blit will convert their pixels.", stacklevel=2)
@@ -5,16 +5,16 @@ from sound_manager import SoundManager
 
 
 class EOLAnimation:
-    def __init__(self, level: Level, dt: float):
+    def __init__(self, level: Level):
         self.target_points = level.points
         self.current_points: float = 0.0
-        self.delta: float = self.target_points * dt / co.EOL_ANIMATION_DURATION
+        self.speed: float = self.target_points / co.EOL_ANIMATION_DURATION  # Points per second
         self.required_points = level.required_points
         self.target_medals = level.get_medals()
         self.current_medals = [0] * len(self.target_medals)
 
-    def update(self):
-        self.current_points += self.delta
+    def update(self, dt: float):
+        self.current_points += self.speed * dt
         for i, pts in enumerate(self.required_points):
             if self.current_points >= pts and self.current_medals[i] != self.target_medals[i]:
                 self.current_medals[i] = self.target_medals[i]
@@ -5,13 +5,15 @@ import pygame
 import constants as co
 import window
 
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
 
 class EventManager:
     """
     A class to ease the use of premade and custom events of PyGame.
     """
 
-    def __init__(self, use_default_quit_callback: bool = True):
+    def __init__(self, use_default_quit_callback: bool = True, coalesce_mouse_motion: bool = False):
         """
         Initialize the event manager instance. No callback are set at the beginning,
         except the one for the 'QUIT' event if specified.
@@ -21,6 +23,9 @@ class EventManager:
         use_default_quit_callback : bool, default = True
             Indicates if the manager should use the Window.close function as a callback
             for the 'QUIT' event (default: True).
+        coalesce_mouse_motion : bool, default = False
+            If True, consecutive 'MOUSEMOTION' events fetched by the same call to listen are merged into one,
+            so that the mouse motion callback is called at most once between two other events.
         """
 
         self.quit_callback: Callable[[], None] = None
@@ -30,11 +35,15 @@ class EventManager:
         self.mouse_button_down_callback: Callable[[dict], None] = None
         self.mouse_button_up_callback: Callable[[dict], None] = None
         self.music_end_callback: Callable[[], None] = None
+        self.video_resize_callback: Callable[[dict], None] = None
 
         if use_default_quit_callback:
             self.quit_callback = window.Window.close
 
         self.custom_events: dict[str, Callable] = dict()
+        self.input_event_count: int = 0  # Keyboard and mouse events of the last call to listen
+        self.coalesce_mouse_motion = coalesce_mouse_motion
+        self.waited_events: list[pygame.event.Event] = list()  # Fetched by wait, dispatched by the next listen
 
     def set_quit_callback(self, callback: Callable[[], None]):
         """
@@ -127,6 +136,19 @@ class EventManager:
 
         self.music_end_callback = callback
 
+    def set_video_resize_callback(self, callback: Callable[[dict], None]):
+        """
+        Set the callback for the 'VIDEORESIZE' event.
+
+        Parameters
+        ----------
+        callback : Callable
+            Function to be called when this event occurs.
+            It should have only one parameter : a dictionary containing the event data.
+        """
+
+        self.video_resize_callback = callback
+
     def add_custom_event(self, event_name: str, callback: Callable[[dict], None]):
         """
         Add a custom event with the specified name to the manager.
@@ -149,6 +171,28 @@ class EventManager:
 
         self.custom_events[event_name] = callback
 
+    def wait(self, timeout: int) -> bool:
+        """
+        Block until an event is received or the timeout expires, without calling any callback: the event is
+        dispatched by the next call to listen, in order with the ones received after it.
+        Returns True if an event was received, False otherwise.
+
+        Parameters
+        ----------
+        timeout : int
+            Maximum waiting time (ms). Returns right away if it is not positive, as pygame then waits indefinitely.
+        """
+
+        if timeout <= 0 or not pygame.display.get_init():
+            return False
+
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return False
+
+        self.waited_events.append(event)
+        return True
+
     def listen(self) -> bool:
         """Listen for incoming events, and call the right function accordingly.
         Returns True if it could fetch events, False otherwise.
@@ -157,8 +201,26 @@ class EventManager:
         if not pygame.display.get_init():
             return False
 
-        for event in pygame.event.get():
+        self.input_event_count = 0
+        motion: dict | None = None  # Merged data of the consecutive motion events not dispatched yet
+        events = pygame.event.get()
+        if self.waited_events:
+            events = self.waited_events + events
+            self.waited_events = list()
+        for event in events:
             event_type = event.type
+            if event_type in INPUT_EVENTS:
+                self.input_event_count += 1
+
+            if self.coalesce_mouse_motion:
+                if event_type == pygame.MOUSEMOTION:
+                    motion = self.__merge_motion(motion, event.dict)
+                    continue
+                if motion is not None and self.mouse_motion_callback is not None:
+                    # Dispatched before the other event, to keep the order
+                    self.mouse_motion_callback(motion)
+                motion = None
+
             if event_type == pygame.QUIT and self.quit_callback is not None:
                 self.quit_callback()
 
@@ -177,6 +239,9 @@ class EventManager:
             elif event_type == pygame.MOUSEBUTTONUP and self.mouse_button_up_callback is not None:
                 self.mouse_button_up_callback(event.dict)
 
+            elif event_type == pygame.VIDEORESIZE and self.video_resize_callback is not None:
+                self.video_resize_callback(event.dict)
+
             elif event_type == co.MUSICENDEVENT and self.music_end_callback is not None:
                 self.music_end_callback()
 
@@ -185,4 +250,18 @@ class EventManager:
                 if event_name in self.custom_events:
                     self.custom_events[event_name](event.dict)
 
+        if motion is not None and self.mouse_motion_callback is not None:
+            self.mouse_motion_callback(motion)
+
         return True
+
+    @staticmethod
+    def __merge_motion(motion: dict | None, data: dict) -> dict:
+        """Returns the motion followed by the one of the data: the motions are summed, the rest is the latest."""
+
+        if motion is None:
+            return dict(data)
+
+        merged = dict(data)
+        merged['rel'] = (motion['rel'][0] + data['rel'][0], motion['rel'][1] + data['rel'][1])
+        return merged
@@ -1,17 +1,30 @@
+import asyncio
+import functools
+import gc
+import logging
 import math
+import time
 
 import pygame as pyg
 
 import constants as co
+import display_format
+import glyph_atlas
 import sounds
 import textures
 import utils
+from asset_loader import AssetLoader
 from bg_animation import BackgroundAnimation
-from constants import GameState
+from constants import GameState, QualityStep
 from eol_animation import EOLAnimation
 from event_manager import EventManager
 from level import Level, LevelManager
 from options import Options
+from pacing import FramePacer
+from profiling import PROFILER
+from quality import GOVERNOR
+from render_scale import AutoRenderScale
+from scheduler import SCHEDULER
 from screen_shake import SHAKER
 from sound_manager import SoundManager
 from window import Scale, Window
@@ -25,15 +38,37 @@ class Game:
         utils.SCALE = scale.scale
         self.bg_animation = BackgroundAnimation(self.scale)
         self.is_browser = is_browser
-
-        self.target_fps = 60
-        self.clock = pyg.time.Clock()
-
-        self.events = EventManager()
+        self.is_fullscreen = bool(screen.get_flags() & pyg.FULLSCREEN)
+
+        # Size the frame is drawn at, and the scale and the textures are for. The frame is upscaled to the screen if
+        # it is smaller, because of the render scale or until the textures are rescaled after a resize
+        self.render_size: tuple[int, int] = screen.get_size()
+        # Reused every frame, opaque and in the display format so that the blits on them are as fast as possible
+        self.render_frame: pyg.Surface | None = None
+        self.upscaled_frame: pyg.Surface | None = None
+        # Credit, options and letterbox bars, drawn again only when the state they depend on changes
+        self.chrome_overlay: pyg.Surface | None = None
+        self.chrome_key: tuple | None = None
+        display_format.add_listener(self.clear_frames)
+        self.is_resized: bool = False
+        self.resize_time: float = 0.0
+
+        self.target_fps = co.DEFAULT_REFRESH_RATE
+        self.pacer = FramePacer(can_sleep=not is_browser)
+        self.auto_render_scale = AutoRenderScale(self.target_fps)
+        GOVERNOR.target_fps = self.target_fps
+
+        # The motion callback updates the hover of the cells and circles, once per frame is enough
+        self.events = EventManager(coalesce_mouse_motion=True)
         self.events.set_quit_callback(self.stop)
 
         self.frame: int = 0
-        self.dt: int = 0
+        self.dt: float = 0.0  # ms
+        # Time not simulated yet (s), the simulation advancing by steps of SIMULATION_STEP whatever the frame rate
+        self.accumulator: float = 0.0
+        self.skipped_renders: int = 0
+        self.is_rendered: bool = False
+        self.idle_time: float = 0.0  # Time since the last input or animation (s)
 
         self.options: Options = Options()
 
@@ -41,18 +76,35 @@ class Game:
 
         self.current_level: Level = None
         self.eol_anim: EOLAnimation = None
+        self.loader: AssetLoader | None = None
+        self.is_garbage_frozen: bool = False
+
+        self.up_down: tuple[float, float] = (0.0, 0.0)  # Time and vertical offset of the bobbing
+        self.in_out: tuple[float, int | None] = (0.0, 0)  # Time and phase of the pulse, None if it is turned off
 
-        self.up_down: tuple[float, float] = (0.0, 0.0)
-        self.in_out: tuple[float, float] = (0.0, 0.0)
+        self.is_hardware_cursor: bool = False
+        self.mouse_pos: tuple[int, int] = (0, 0)  # Position of the mouse when it was last read
 
         self.events.set_mouse_button_down_callback(self.click)
         self.events.set_mouse_button_up_callback(self.unclick)
         self.events.set_mouse_motion_callback(self.mouse_move)
         self.events.set_key_down_callback(self.key_down)
+        self.events.set_video_resize_callback(self.video_resize)
 
     def key_down(self, data: dict):
         if not self.is_browser and data['key'] == co.ESC_KEY:
             self.stop()
+        if not self.is_browser and data['key'] == co.F11_KEY:
+            self.toggle_fullscreen()
+        if data['key'] == co.F3_KEY:
+            PROFILER.toggle()
+        if data['key'] == co.F9_KEY:
+            self.options.low_latency_input = not self.options.low_latency_input
+            self.update_cursor()
+        if data['key'] == co.F10_KEY:
+            self.options.cycle_render_scale()
+            self.auto_render_scale.reset()
+            self.rescale()
 
         if self.state == GameState.PLAYING_LEVEL:
             if data['key'] == co.R_KEY:
@@ -72,7 +124,7 @@ class Game:
                 self.open_main_menu()
 
     def click(self, data: dict):
-        x, y = self.scale.to_game_pos(*data['pos'])
+        x, y = self.to_game_pos(data['pos'])
         button = data['button']
         if button == co.LEFT_CLICK:
             self.left_click(x, y)
@@ -120,7 +172,7 @@ class Game:
             self.open_main_menu()
             sound_to_play = sounds.BUTTON_CLICK
 
-        if self.state != GameState.BROWSER_WAIT_FOR_CLICK and self.state != GameState.END_OF_GAME:
+        if self.are_options_shown():
             if co.MUSIC_VOLUME_BTN_RECT.collidepoint(x, y):
                 self.options.cycle_music_volume()
                 sound_to_play = sounds.BUTTON_CLICK
@@ -140,7 +192,7 @@ class Game:
             sound_to_play = sounds.REMOVE_CIRCLE if self.current_level.temp_circle is not None else ""
             self.current_level.destroy_temp_circle()
 
-        if self.state != GameState.BROWSER_WAIT_FOR_CLICK and self.state != GameState.END_OF_GAME:
+        if self.are_options_shown():
             if co.MUSIC_VOLUME_BTN_RECT.collidepoint(x, y):
                 self.options.cycle_music_volume_rev()
                 sound_to_play = sounds.BUTTON_CLICK
@@ -157,29 +209,125 @@ class Game:
     def unclick(self, data: dict):
         if self.state == GameState.PLAYING_LEVEL and self.options.hold_to_grow:
             self.current_level.validate_temp_circle()
-            x, y = self.scale.to_game_pos(*data['pos'])
+            x, y = self.to_game_pos(data['pos'])
             self.current_level.update_hovered_circle(int(x), int(y))
 
     def mouse_move(self, data: dict):
         if self.state == GameState.PLAYING_LEVEL:
-            x, y = self.scale.to_game_pos(*data['pos'])
+            x, y = self.to_game_pos(data['pos'])
             rel_x, rel_y = data['rel']
             self.current_level.on_mouse_move(int(x), int(y), int(rel_x * self.scale.scale),
                                              int(rel_y * self.scale.scale))
 
+    def video_resize(self, data: dict):
+        self.screen = pyg.display.get_surface()
+        # The textures are rescaled once the window stops being resized
+        self.is_resized = True
+        self.resize_time = time.perf_counter()
+
+    def toggle_fullscreen(self):
+        self.is_fullscreen = not self.is_fullscreen
+        self.screen = Window.set_mode(*co.WINDOWED_SIZE, fullscreen=self.is_fullscreen, resizable=True)
+        self.update_target_fps()
+        self.rescale()
+
+    def get_render_scale(self) -> float:
+        if self.options.render_scale == co.RENDER_SCALE_AUTO:
+            return self.auto_render_scale.get_scale()
+        return self.options.render_scale
+
+    def get_render_size(self) -> tuple[int, int]:
+        """Returns the size the frame should be drawn at, from the size of the screen and the render scale."""
+
+        render_scale = self.get_render_scale()
+        width, height = self.screen.get_size()
+        return max(1, round(width * render_scale)), max(1, round(height * render_scale))
+
+    def rescale(self):
+        """
+        Rescale the textures to the render size in the background, the game is drawn stretched to the screen until then.
+        """
+
+        self.is_resized = False
+        size = self.get_render_size()
+        scale = Window.get_scale(co.WIDTH, co.HEIGHT, screen_width=size[0], screen_height=size[1])
+
+        if self.loader is None:
+            self.loader = AssetLoader(max_workers=0 if self.is_browser else None)
+        textures.rescale(self.loader, scale, None if self.is_browser else size,
+                         lambda: self.on_rescaled(scale, size))
+
+    def on_rescaled(self, scale: Scale, size: tuple[int, int]):
+        self.scale = scale
+        utils.SCALE = scale.scale
+        self.render_size = size
+        self.bg_animation.set_scale(scale)
+        self.warm_up_glyph_atlases()
+
+    def get_render_rect(self) -> pyg.Rect:
+        """Returns where the frame is drawn on the screen, which differs from the screen while it is rescaled."""
+
+        screen_width, screen_height = self.screen.get_size()
+        ratio = min(screen_width / self.render_size[0], screen_height / self.render_size[1])
+        width, height = int(self.render_size[0] * ratio), int(self.render_size[1] * ratio)
+        return pyg.Rect((screen_width - width) // 2, (screen_height - height) // 2, width, height)
+
+    def to_game_pos(self, screen_pos: tuple[float, float]) -> tuple[float, float]:
+        x, y = screen_pos
+        if self.render_size != self.screen.get_size():
+            render_rect = self.get_render_rect()
+            x = (x - render_rect.x) * self.render_size[0] / render_rect.width
+            y = (y - render_rect.y) * self.render_size[1] / render_rect.height
+        return self.scale.to_game_pos(x, y)
+
+    def is_credit_shown(self) -> bool:
+        return self.state not in (GameState.LOADING, GameState.BROWSER_WAIT_FOR_CLICK)
+
+    def are_options_shown(self) -> bool:
+        return self.state not in (GameState.LOADING, GameState.BROWSER_WAIT_FOR_CLICK, GameState.END_OF_GAME)
+
+    def update_target_fps(self):
+        """Target the refresh rate of the options, or the one of the display."""
+
+        refresh_rate = self.options.refresh_rate
+        if refresh_rate == co.REFRESH_RATE_AUTO:
+            refresh_rate = pyg.display.get_current_refresh_rate() or co.DEFAULT_REFRESH_RATE
+        self.target_fps = refresh_rate
+        self.auto_render_scale.target_fps = refresh_rate
+        GOVERNOR.target_fps = refresh_rate
+
     def start(self):
         pyg.mouse.set_visible(False)
-        textures.load_all(self.scale)
         SoundManager.instance().options = self.options
-        sounds.load_sounds()
-        sounds.start_music()
-        self.options.update_music_volume()
+        self.update_target_fps()
+
+        textures.setup(self.scale, None if self.is_browser else self.screen.get_size())
+        glyph_atlas.set_cache_path(None if self.is_browser else co.GLYPH_CACHE_PATH)
+        sounds.set_bank_path(None if self.is_browser else co.SOUND_BANK_PATH)
+        sounds.register_sounds()
 
+        # The browser has no threads, so everything is decoded on the main thread between two frames
+        self.loader = AssetLoader(max_workers=0 if self.is_browser else None)
+        textures.queue(self.loader, textures.PRELOADED_TEXTURES)
+        sounds.queue_sounds(self.loader, sounds.PRELOADED_SOUNDS)
+        self.state = GameState.LOADING
+
+    def on_assets_loaded(self):
+        # The loading screen is left first, so that this is not run again on the next frames if something below fails
         if self.is_browser:
             self.state = GameState.BROWSER_WAIT_FOR_CLICK
         else:
             self.open_main_menu()
 
+        # The other assets are loaded in the background, or when they are first used if it is not finished yet
+        textures.queue(self.loader, textures.ALL_TEXTURES)
+        sounds.queue_sounds(self.loader)
+
+        sounds.start_music()
+        self.options.update_music_volume()
+        self.update_cursor()
+        self.warm_up_glyph_atlases()
+
     def stop(self):
         self.is_ended = True
 
@@ -213,42 +361,173 @@ class Game:
             self.current_level = LevelManager.instance().current_level
             self.state = GameState.PLAYING_LEVEL
 
+    async def run(self):
+        """Run the game until it ends: the frames, and the background tasks between them."""
+
+        SCHEDULER.start(self.run_loader())
+
+        while not self.is_ended:
+            self.loop()
+            await SCHEDULER.run_slice(co.LOADING_TASK_TIME_SLICE if self.state == GameState.LOADING
+                                      else co.TASK_TIME_SLICE)
+            SCHEDULER.run_deferred(self.pacer.get_time_left() - co.DEFERRED_WORK_MARGIN)
+            # Lets the browser handle its own events
+            await asyncio.sleep(0)
+
+        SCHEDULER.cancel_all()
+
+    async def run_loader(self):
+        """Task finishing the decoded assets, whenever there is a loader."""
+
+        while True:
+            if self.loader is not None:
+                try:
+                    self.update_loader()
+                except Exception:
+                    logging.exception("Failed to finish the loaded assets")
+            await SCHEDULER.next_slice()
+
+    def update_loader(self):
+        self.loader.update(SCHEDULER.get_remaining_time())
+        if self.loader.is_finished():
+            if self.state == GameState.LOADING:
+                self.on_assets_loaded()
+            else:
+                self.loader.close()
+                self.loader = None
+                SCHEDULER.defer(self.collect_garbage, co.GARBAGE_COLLECTION_PRIORITY, co.GARBAGE_COLLECTION_COST)
+
+    def collect_garbage(self):
+        """
+        Collect the garbage. After the assets are first loaded, the objects left, mostly the assets, are also excluded
+        from the next collections: the full collections which Python runs from time to time during the frames are much
+        shorter then. They are only excluded once, as the objects alive after a rescale include the current level,
+        which would never be collected.
+        """
+
+        gc.collect()
+        if not self.is_garbage_frozen:
+            gc.freeze()
+            self.is_garbage_frozen = True
+
+    @staticmethod
+    def warm_up_glyph_atlases():
+        for size, color in co.WARM_UP_GLYPH_ATLASES:
+            SCHEDULER.defer(functools.partial(utils.get_glyph_atlas, size, color), co.GLYPH_ATLAS_WARM_UP_PRIORITY,
+                            co.GLYPH_ATLAS_WARM_UP_COST)
+
     def loop_game(self):
+        if self.is_resized and time.perf_counter() - self.resize_time >= co.RESIZE_DELAY:
+            self.rescale()
+
+        self.is_rendered = False
+        self.accumulator += self.dt / 1000
+        steps = 0
+        while self.accumulator >= co.SIMULATION_STEP and steps < co.MAX_SIMULATION_STEPS:
+            self.update(co.SIMULATION_STEP)
+            self.accumulator -= co.SIMULATION_STEP
+            steps += 1
+
+        if self.accumulator >= co.SIMULATION_STEP:
+            # Behind real time: the next frames only simulate to catch up, or the late time is dropped if it is too long
+            if self.skipped_renders < co.MAX_SKIPPED_RENDERS:
+                self.skipped_renders += 1
+                return
+            self.accumulator %= co.SIMULATION_STEP
+        self.skipped_renders = 0
+
+        if self.options.low_latency_input:
+            self.latch_input()
+        else:
+            self.mouse_pos = pyg.mouse.get_pos()
+        self.draw()
+        self.is_rendered = True
+
+    def update(self, dt: float):
+        """Advance the simulation by dt (s). It is always SIMULATION_STEP, so that it does not depend on the frame rate."""
+
         if self.state == GameState.PLAYING_LEVEL:
             if not LevelManager.instance().current_level_ended:
-                self.current_level.update(self.dt / 1000)
+                self.current_level.update(dt)
             else:
-                self.eol_anim = EOLAnimation(self.current_level, self.dt / 1000)
+                self.eol_anim = EOLAnimation(self.current_level)
                 self.state = GameState.END_OF_LEVEL
                 SoundManager.instance().play_sound(sounds.EOL_ANIM_CLICK)
 
-        self.up_down = (self.up_down[0] + self.dt / 1000, 4 * math.sin(2.5 * self.up_down[0]))
-        self.in_out = (self.in_out[0] + self.dt / 1000, 1 + 0.03 * math.sin(2.5 * self.in_out[0]))
+        if self.state != GameState.BROWSER_WAIT_FOR_CLICK and self.state != GameState.LOADING:
+            self.bg_animation.update(dt, self.get_bg_excl_rect())
 
-        textures.CELL_ANIMATOR.play_all(self.dt / 1000)
+        self.up_down = (self.up_down[0] + dt,
+                        utils.BOB_OFFSETS[utils.get_phase(self.up_down[0], co.BOB_SPEED, co.BOB_PHASE_COUNT)])
+        if GOVERNOR.is_enabled(QualityStep.PULSING_BUTTONS):
+            self.in_out = (self.in_out[0] + dt, utils.get_phase(self.in_out[0], co.PULSE_SPEED, co.PULSE_PHASE_COUNT))
+        else:
+            self.in_out = (self.in_out[0] + dt, None)
+
+        textures.CELL_ANIMATOR.play_all(dt)
+        SHAKER.update(dt)
         if self.eol_anim is not None:
-            self.eol_anim.update()
+            self.eol_anim.update(dt)
             if self.eol_anim.is_finished():
                 self.eol_anim = None
-        self.draw()
+
+    def get_bg_excl_rect(self) -> pyg.Rect | None:
+        """Returns the rect the background cells stay out of."""
+
+        if self.state == GameState.PLAYING_LEVEL:
+            return self.current_level.rect
+        if self.state == GameState.END_OF_LEVEL:
+            return co.EOL_BG_RECT
+        return None
+
+    def update_cursor(self):
+        """Use the hardware cursor in low latency mode if possible, otherwise the cursor is drawn with the frame."""
+
+        self.is_hardware_cursor = False
+        if self.options.low_latency_input:
+            try:
+                pyg.mouse.set_cursor(pyg.cursors.Cursor((co.CURSOR_OFFSET, co.CURSOR_OFFSET), textures.CURSOR))
+                self.is_hardware_cursor = True
+            except pyg.error:
+                pass
+        pyg.mouse.set_visible(self.is_hardware_cursor)
+
+    def latch_input(self):
+        """
+        Read the mouse again just before drawing, so that the hover and the release of a growing circle are as late
+        as possible before the frame is presented, instead of when the events were read at the start of the frame.
+        """
+
+        pyg.event.pump()
+        mouse_pos = pyg.mouse.get_pos()
+        is_released = not pyg.mouse.get_pressed()[0]
+        has_input = mouse_pos != self.mouse_pos
+        self.mouse_pos = mouse_pos
+
+        if self.state == GameState.PLAYING_LEVEL and self.current_level.animation == 0:
+            x, y = self.to_game_pos(mouse_pos)
+            if self.options.hold_to_grow and self.current_level.temp_circle is not None and is_released:
+                # Its MOUSEBUTTONUP event is read on the next frame, and does nothing then
+                self.current_level.validate_temp_circle()
+                has_input = True
+            if has_input:
+                self.current_level.update_hovered_circle(int(x), int(y))
+        PROFILER.poll(has_input)
+
+    def clear_frames(self):
+        self.render_frame = None
+        self.upscaled_frame = None
+        self.chrome_overlay = None
 
     def draw(self):
-        game_surface = pyg.Surface((co.WIDTH, co.HEIGHT), pyg.SRCALPHA)
-        if self.state != GameState.BROWSER_WAIT_FOR_CLICK:
+        if self.render_frame is None or self.render_frame.get_size() != self.render_size:
+            self.render_frame = display_format.create_opaque_surface(self.render_size)
+        game_surface = self.render_frame
+        if self.state != GameState.BROWSER_WAIT_FOR_CLICK and self.state != GameState.LOADING:
             game_surface.blit(
                 textures.BACKGROUND if self.state != GameState.END_OF_LEVEL else textures.END_OF_LEVEL_BACKGROUND,
                 self.scale.to_screen_pos(0, 0))
-
-            if self.state == GameState.PLAYING_LEVEL:
-                excl_rect = self.current_level.rect
-            elif self.state == GameState.END_OF_LEVEL:
-                excl_rect = co.EOL_BG_RECT
-            else:
-                excl_rect = None
-            self.bg_animation.draw(game_surface, excl_rect, self.dt / 1000)
-
-            utils.draw_text(game_surface, "By charon25", 42, self.scale.to_screen_pos(*co.CREDIT_TEXT_POS),
-                            co.MEDIUM_COLOR)
+            self.bg_animation.draw(game_surface)
 
         if self.state == GameState.PLAYING_LEVEL:
             self.draw_game(game_surface)
@@ -262,60 +541,112 @@ class Game:
         elif self.state == GameState.END_OF_GAME:
             self.draw_end_of_game(game_surface)
 
+        elif self.state == GameState.LOADING:
+            self.draw_loading(game_surface)
+
         elif self.state == GameState.BROWSER_WAIT_FOR_CLICK:
             game_surface.fill(co.DARK_COLOR)
             utils.draw_text_center(game_surface, "Click anywhere to start the game", 100,
                                    self.scale.to_screen_rect(pyg.Rect(0, 0, co.WIDTH, co.HEIGHT)), (255, 255, 255))
 
-        utils.draw_text(game_surface, f'{self.clock.get_fps():.0f} fps', 16, self.scale.to_screen_pos(1870, 1060),
-                        co.DARK_COLOR)
+        fps_text = f'{self.pacer.get_fps():.0f} fps'
+        if self.get_render_scale() != 1:
+            fps_text += f' ({self.get_render_scale():.0%})'
+        utils.draw_text(game_surface, fps_text, 16, self.scale.to_screen_pos(1870, 1060), co.DARK_COLOR)
+
+        self.draw_chrome(game_surface)
+
+        PROFILER.draw(game_surface, self.scale)
+
+        if self.state != GameState.LOADING and not self.is_hardware_cursor:
+            mouse_x, mouse_y = self.to_game_pos(self.mouse_pos)
+            game_surface.blit(textures.CURSOR, self.scale.to_screen_pos(mouse_x - co.CURSOR_OFFSET / self.scale.scale,
+                                                                        mouse_y - co.CURSOR_OFFSET / self.scale.scale))
 
-        if self.state != GameState.BROWSER_WAIT_FOR_CLICK and self.state != GameState.END_OF_GAME:
-            utils.draw_text_next_to_img(game_surface, textures.VOLUMES[self.options.music_volume],
+        if self.render_size == self.screen.get_size():
+            self.screen.blit(game_surface, SHAKER.get_offset())
+        else:
+            # Drawn at a lower resolution, or with the textures of the previous size until they are rescaled
+            render_rect = self.get_render_rect()
+            if self.upscaled_frame is None or self.upscaled_frame.get_size() != render_rect.size:
+                self.upscaled_frame = display_format.create_opaque_surface(render_rect.size)
+            pyg.transform.scale(game_surface, render_rect.size, self.upscaled_frame)
+            if render_rect.size != self.screen.get_size():
+                self.screen.fill(co.BLACK)
+            self.screen.blit(self.upscaled_frame, render_rect.move(SHAKER.get_offset()))
+
+    def draw_chrome(self, game_surface: pyg.Surface):
+        """
+        Blit the credit, the options and the letterbox bars. They only change with the options and the state, so
+        they are drawn once on an overlay, RLE-accelerated so that its transparent pixels are skipped quickly.
+        """
+
+        key = (self.render_size, self.scale.scale, self.scale.x_offset, self.scale.y_offset, self.is_credit_shown(),
+               self.are_options_shown(), self.options.music_volume, self.options.sfx_volume,
+               self.options.hold_to_grow)
+        if self.chrome_overlay is None or key != self.chrome_key:
+            self.chrome_overlay = pyg.Surface(self.render_size, pyg.SRCALPHA)
+            self.build_chrome(self.chrome_overlay)
+            self.chrome_overlay = display_format.convert(self.chrome_overlay)
+            self.chrome_overlay.set_alpha(255, pyg.RLEACCEL)
+            self.chrome_key = key
+        game_surface.blit(self.chrome_overlay, (0, 0))
+
+    def build_chrome(self, surface: pyg.Surface):
+        if self.is_credit_shown():
+            utils.draw_text(surface, "By charon25", 42, self.scale.to_screen_pos(*co.CREDIT_TEXT_POS),
+                            co.MEDIUM_COLOR)
+
+        if self.are_options_shown():
+            utils.draw_text_next_to_img(surface, textures.VOLUMES[self.options.music_volume],
                                         self.scale.to_screen_pos(*co.MUSIC_VOLUME_BTN_POS),
                                         co.OPTION_TEXT_BTN_GAP * self.scale.scale, 'Music', co.OPTION_TEXT_SIZE,
                                         co.MEDIUM_COLOR)
-            utils.draw_text_next_to_img(game_surface, textures.VOLUMES[self.options.sfx_volume],
+            utils.draw_text_next_to_img(surface, textures.VOLUMES[self.options.sfx_volume],
                                         self.scale.to_screen_pos(*co.SFX_VOLUME_BTN_POS),
                                         co.OPTION_TEXT_BTN_GAP * self.scale.scale, 'SFX', co.OPTION_TEXT_SIZE,
                                         co.MEDIUM_COLOR)
 
-            utils.draw_text_center_right(game_surface, 'Hold click', co.OPTION_TEXT_SIZE,
+            utils.draw_text_center_right(surface, 'Hold click', co.OPTION_TEXT_SIZE,
                                          self.scale.to_screen_rect(co.HOLD_TEXT_RECT_1), co.MEDIUM_COLOR)
-            utils.draw_text_center_right(game_surface, 'to grow', co.OPTION_TEXT_SIZE,
+            utils.draw_text_center_right(surface, 'to grow', co.OPTION_TEXT_SIZE,
                                          self.scale.to_screen_rect(co.HOLD_TEXT_RECT_2), co.MEDIUM_COLOR)
-            game_surface.blit(textures.CHECKBOXES[self.options.hold_to_grow],
-                              self.scale.to_screen_pos(*co.HOLD_BTN_POS))
+            surface.blit(textures.CHECKBOXES[self.options.hold_to_grow],
+                         self.scale.to_screen_pos(*co.HOLD_BTN_POS))
 
         if self.scale.x_offset > 0:
-            pyg.draw.rect(game_surface, co.BLACK, pyg.Rect(0, 0, self.scale.x_offset, co.HEIGHT * self.scale.scale))
-            pyg.draw.rect(game_surface, co.BLACK,
+            pyg.draw.rect(surface, co.BLACK, pyg.Rect(0, 0, self.scale.x_offset, co.HEIGHT * self.scale.scale))
+            pyg.draw.rect(surface, co.BLACK,
                           pyg.Rect(self.scale.x_offset + co.WIDTH * self.scale.scale, 0, self.scale.x_offset,
                                    co.HEIGHT * self.scale.scale))
         elif self.scale.y_offset > 0:
-            pyg.draw.rect(game_surface, co.BLACK, pyg.Rect(0, 0, co.WIDTH * self.scale.scale, self.scale.y_offset))
-            pyg.draw.rect(game_surface, co.BLACK,
+            pyg.draw.rect(surface, co.BLACK, pyg.Rect(0, 0, co.WIDTH * self.scale.scale, self.scale.y_offset))
+            pyg.draw.rect(surface, co.BLACK,
                           pyg.Rect(0, self.scale.y_offset + co.HEIGHT * self.scale.scale, co.WIDTH * self.scale.scale,
                                    self.scale.y_offset))
 
-        mouse_x, mouse_y = self.scale.to_game_pos(*pyg.mouse.get_pos())
-        game_surface.blit(textures.CURSOR, self.scale.to_screen_pos(mouse_x - co.CURSOR_OFFSET / self.scale.scale,
-                                                                    mouse_y - co.CURSOR_OFFSET / self.scale.scale))
+    def draw_loading(self, game_surface: pyg.Surface):
+        game_surface.fill(co.DARK_COLOR)
+        utils.draw_text_center(game_surface, "Loading...", 100, self.scale.to_screen_rect(co.LOADING_TEXT_RECT),
+                               co.LIGHT_COLOR)
 
-        self.screen.blit(game_surface, SHAKER.get_next())
+        bar_rect = self.scale.to_screen_rect(co.LOADING_BAR_RECT)
+        pyg.draw.rect(game_surface, co.MEDIUM_COLOR, bar_rect)
+        bar_rect.width = int(bar_rect.width * self.loader.get_progress())
+        pyg.draw.rect(game_surface, co.LIGHT_COLOR, bar_rect)
 
     def draw_game(self, game_surface):
-        self.current_level.draw(game_surface, self.scale, self.dt / 1000, self.up_down[1])
+        self.current_level.draw(game_surface, self.scale, self.accumulator / co.SIMULATION_STEP, self.up_down[1])
 
-        utils.blit_scaled(game_surface, textures.RESTART_LEVEL_BUTTON,
-                          *self.scale.to_screen_pos(co.RESTART_LEVEL_BTN_POS[0],
-                                                    co.RESTART_LEVEL_BTN_POS[1]),
-                          self.in_out[1])
+        utils.blit_pulsing(game_surface, textures.RESTART_LEVEL_BUTTON,
+                           *self.scale.to_screen_pos(co.RESTART_LEVEL_BTN_POS[0],
+                                                     co.RESTART_LEVEL_BTN_POS[1]),
+                           self.in_out[1])
 
-        utils.blit_scaled(game_surface, textures.PREVIOUS_LEVEL_BUTTON,
-                          *self.scale.to_screen_pos(co.PREVIOUS_LEVEL_BTN_POS[0],
-                                                    co.PREVIOUS_LEVEL_BTN_POS[1]),
-                          self.in_out[1])
+        utils.blit_pulsing(game_surface, textures.PREVIOUS_LEVEL_BUTTON,
+                           *self.scale.to_screen_pos(co.PREVIOUS_LEVEL_BTN_POS[0],
+                                                     co.PREVIOUS_LEVEL_BTN_POS[1]),
+                           self.in_out[1])
 
     def draw_end_of_level(self, game_surface: pyg.Surface):
         game_surface.blit(textures.END_OF_LEVEL_TITLE,
@@ -342,18 +673,18 @@ class Game:
                     pyg.Rect(pos[0], co.MEDAL_TEXT_Y + self.up_down[1], co.MEDAL_WIDTH, co.MEDAL_TEXT_FONT_SIZE)), 8,
                                              co.DARK_COLOR, bold=medal > 0)
 
-        utils.blit_scaled(game_surface, textures.RESTART_LEVEL_BUTTON,
-                          *self.scale.to_screen_pos(co.EOL_RESTART_LEVEL_BTN_POS[0],
-                                                    co.EOL_RESTART_LEVEL_BTN_POS[1]),
-                          self.in_out[1])
-        utils.blit_scaled(game_surface, textures.NEXT_LEVEL_BUTTON,
-                          *self.scale.to_screen_pos(co.NEXT_LEVEL_BTN_POS[0], co.NEXT_LEVEL_BTN_POS[1]),
-                          self.in_out[1])
+        utils.blit_pulsing(game_surface, textures.RESTART_LEVEL_BUTTON,
+                           *self.scale.to_screen_pos(co.EOL_RESTART_LEVEL_BTN_POS[0],
+                                                     co.EOL_RESTART_LEVEL_BTN_POS[1]),
+                           self.in_out[1])
+        utils.blit_pulsing(game_surface, textures.NEXT_LEVEL_BUTTON,
+                           *self.scale.to_screen_pos(co.NEXT_LEVEL_BTN_POS[0], co.NEXT_LEVEL_BTN_POS[1]),
+                           self.in_out[1])
 
     def draw_main_menu(self, game_surface: pyg.Surface):
         game_surface.blit(textures.LOGO, self.scale.to_screen_pos(co.LOGO_POS[0], co.LOGO_POS[1] + self.up_down[1]))
-        utils.blit_scaled(game_surface, textures.PLAY_BUTTON,
-                          *self.scale.to_screen_pos(co.PLAY_BTN_POS[0], co.PLAY_BTN_POS[1]), self.in_out[1])
+        utils.blit_pulsing(game_surface, textures.PLAY_BUTTON,
+                           *self.scale.to_screen_pos(co.PLAY_BTN_POS[0], co.PLAY_BTN_POS[1]), self.in_out[1])
         game_surface.blit(textures.GMTK_LOGO, self.scale.to_screen_pos(20, 20))
         if self.is_browser:
             game_surface.blit(textures.BROWSER_TEXT, self.scale.to_screen_pos(*co.BROWSER_TEXT_POS))
@@ -383,18 +714,68 @@ class Game:
                         f'{sum(LevelManager.instance().gold_medals.values())} / {len(LevelManager.instance().gold_medals)}',
                         co.EOG_GOLD_MEDAL_TEXT_SIZE, self.scale.to_screen_pos(*co.EOG_GOLD_MEDAL_TEXT_POS),
                         co.MEDIUM_COLOR)
-        utils.blit_scaled(game_surface, textures.RESTART_GAME_BUTTON,
-                          *self.scale.to_screen_pos(co.EOG_RESTART_BTN_POS[0],
-                                                    co.EOG_RESTART_BTN_POS[1]), self.in_out[1])
+        utils.blit_pulsing(game_surface, textures.RESTART_GAME_BUTTON,
+                           *self.scale.to_screen_pos(co.EOG_RESTART_BTN_POS[0],
+                                                     co.EOG_RESTART_BTN_POS[1]), self.in_out[1])
+
+    def is_idle(self) -> bool:
+        """Returns True if there was no input and nothing but the ambient animations is moving."""
+
+        if self.events.input_event_count > 0 or self.loader is not None or self.is_resized:
+            return False
+        if self.state == GameState.LOADING or self.eol_anim is not None or SHAKER.is_shaking():
+            return False
+        if self.state == GameState.PLAYING_LEVEL:
+            return not LevelManager.instance().current_level_ended and self.current_level.is_idle()
+        return True
+
+    def is_throttled(self) -> bool:
+        return self.idle_time >= co.IDLE_DELAY
+
+    def tick(self):
+        """
+        Wait for the next frame. When the game is idle, the frame rate is lowered to IDLE_FPS, and natively the wait
+        is interrupted by the first event so that an input is answered as fast as at the full frame rate.
+        """
+
+        if not self.is_throttled():
+            self.dt = self.pacer.tick(self.target_fps)
+        else:
+            self.dt = self.pacer.tick(co.IDLE_FPS, lambda duration: self.events.wait(max(1, math.ceil(1000 * duration))))
 
     def loop(self):
         self.frame += 1
-        self.dt = self.clock.tick(self.target_fps)
+        cpu_start = time.process_time()
+        is_throttled = self.is_throttled()
+        self.tick()
+        frame_start = time.perf_counter()
         self.events.listen()
+        PROFILER.poll(self.events.input_event_count > 0)
 
         try:
             self.loop_game()
         except Exception:
             pass
+        SoundManager.instance().update()
+
+        if self.is_rendered:
+            pyg.display.update()
+            PROFILER.present()
+        self.idle_time = self.idle_time + self.dt / 1000 if self.is_idle() else 0.0
+        self.update_quality(time.perf_counter() - frame_start)
+        PROFILER.add_frame(time.process_time() - cpu_start, self.dt / 1000, self.target_fps, is_throttled)
+
+    def update_quality(self, frame_time: float):
+        # The frames are not representative while assets are loaded or rescaled
+        if self.loader is not None or self.state == GameState.LOADING:
+            GOVERNOR.reset()
+            self.auto_render_scale.reset()
+            return
 
-        pyg.display.update()
+        # The effects are turned off before lowering the automatic render scale, and back on after restoring it
+        is_auto = self.options.render_scale == co.RENDER_SCALE_AUTO
+        if GOVERNOR.add_frame(frame_time, can_restore=not is_auto or self.auto_render_scale.scale_index == 0):
+            self.auto_render_scale.reset()
+        elif is_auto and GOVERNOR.is_lowest() and self.auto_render_scale.add_frame(frame_time):
+            GOVERNOR.reset()
+            self.rescale()
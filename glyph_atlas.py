@@ -0,0 +1,169 @@
+import hashlib
+
+import pygame as pyg
+
+import constants as co
+import display_format
+from asset_cache import read_bundle_chunks, read_bundle_index, write_bundle_in_background
+from asset_pack import read_asset
+from render_queue import RenderQueue
+from scheduler import SCHEDULER
+
+ATLASES: dict[tuple[int, tuple[int, int, int]], 'GlyphAtlas'] = dict()
+
+_cache_path: str | None = None
+_cache_chunks: dict[str, list[tuple[dict, bytes]]] | None = None  # Atlases on disk, read when first needed
+_sources_hash: bytes | None = None
+_is_save_deferred: bool = False
+
+
+class GlyphAtlas:
+    """
+    The glyphs of GLYPH_CHARACTERS rendered once for a font size and color, side by side on a single surface.
+    Strings made of these characters are drawn by blitting their glyphs, instead of rendering them with the font.
+    """
+
+    def __init__(self, surface: pyg.Surface, widths: list[int]):
+        self.surface = surface
+        self.height = surface.get_height()
+        self.areas: dict[str, pyg.Rect] = dict()
+        x = 0
+        for char, width in zip(co.GLYPH_CHARACTERS, widths):
+            self.areas[char] = pyg.Rect(x, 0, width, self.height)
+            x += width
+
+    @staticmethod
+    def render(font: pyg.font.Font, color: tuple[int, int, int]) -> 'GlyphAtlas':
+        glyphs = [font.render(char, False, color) for char in co.GLYPH_CHARACTERS]
+        surface = pyg.Surface((sum(glyph.get_width() for glyph in glyphs), max(glyph.get_height() for glyph in glyphs)),
+                              pyg.SRCALPHA)
+        x = 0
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+
+        return GlyphAtlas(display_format.convert(surface), [glyph.get_width() for glyph in glyphs])
+
+    def get_width(self, text: str) -> int:
+        return sum(self.areas[char].width for char in text)
+
+    def get_size(self, text: str) -> tuple[int, int]:
+        return self.get_width(text), self.height
+
+    def get_blits(self, text: str, pos: tuple[float, float]) -> list[tuple[pyg.Surface, tuple[float, float], pyg.Rect]]:
+        blits = list()
+        x, y = pos
+        for char in text:
+            area = self.areas[char]
+            blits.append((self.surface, (x, y), area))
+            x += area.width
+        return blits
+
+    def draw(self, surface: pyg.Surface, text: str, pos: tuple[float, float]):
+        surface.blits(self.get_blits(text, pos), doreturn=False)
+
+    def queue(self, queue: RenderQueue, text: str, pos: tuple[float, float], layer: int = 0):
+        for source, dest, area in self.get_blits(text, pos):
+            queue.add(source, dest, layer, area=area)
+
+
+def can_draw(text: str) -> bool:
+    """Returns True if all the characters of the text are in the atlases."""
+
+    return all(char in co.GLYPH_CHARACTERS for char in text)
+
+
+def set_cache_path(path: str | None):
+    """Set the file the atlases are saved to and read from, or None to always render them."""
+
+    global _cache_path, _cache_chunks
+
+    _cache_path = path
+    _cache_chunks = None
+
+
+def get_atlas(font: pyg.font.Font, font_size: int, color: tuple[int, int, int]) -> GlyphAtlas:
+    """
+    Returns the atlas of the font, rendering it or reading it from the cache the first time.
+
+    Parameters
+    ----------
+    font : pygame.font.Font
+        Font of the glyphs, without any style.
+    font_size : int
+        Size of the font, identifying the atlas.
+    color : tuple of int
+        Color of the glyphs.
+    """
+
+    key = (font_size, color)
+    if key not in ATLASES:
+        name = f'{font_size}_{color[0]}_{color[1]}_{color[2]}'
+        chunks = _get_cache_chunks()
+        if name in chunks:
+            ATLASES[key] = _read_atlas(chunks[name])
+        else:
+            ATLASES[key] = GlyphAtlas.render(font, color)
+            if _cache_path is not None:
+                chunks[name] = _write_atlas(ATLASES[key])
+                _defer_save()
+
+    return ATLASES[key]
+
+
+def _defer_save():
+    global _is_save_deferred
+
+    # The atlases rendered until then are written together
+    if not _is_save_deferred:
+        _is_save_deferred = True
+        SCHEDULER.defer(save, co.GLYPH_CACHE_SAVE_PRIORITY, co.GLYPH_CACHE_SAVE_COST)
+
+
+def save():
+    """Write the atlases to the cache in the background, with the ones rendered since the last save."""
+
+    global _is_save_deferred
+
+    _is_save_deferred = False
+    if _cache_path is not None and _cache_chunks is not None:
+        write_bundle_in_background(_cache_path, _get_sources_hash(), dict(_cache_chunks))
+
+
+def _get_sources_hash() -> bytes:
+    global _sources_hash
+
+    if _sources_hash is None:
+        # The atlases depend on the characters as well as the font
+        _sources_hash = hashlib.sha256(read_asset(co.FONT_PATH) + co.GLYPH_CHARACTERS.encode()).digest()
+    return _sources_hash
+
+
+def _get_cache_chunks() -> dict[str, list[tuple[dict, bytes]]]:
+    global _cache_chunks
+
+    if _cache_chunks is None:
+        _cache_chunks = dict()
+        bundle = None if _cache_path is None else read_bundle_index(_cache_path, _get_sources_hash())
+        if bundle is not None:
+            index, data_position = bundle
+            chunks = read_bundle_chunks(_cache_path, data_position, index, list(index))
+            if chunks is not None:
+                # Each atlas has a single entry, at the start of its chunk
+                for name, (entry,) in index.items():
+                    metadata = {key: value for key, value in entry.items() if key not in ('offset', 'length')}
+                    _cache_chunks[name] = [(metadata, bytes(chunks[name]))]
+
+    return _cache_chunks
+
+
+def _read_atlas(chunk: list[tuple[dict, bytes]]) -> GlyphAtlas:
+    metadata, pixels = chunk[0]
+    surface = pyg.image.frombytes(pixels, (metadata['width'], metadata['height']), metadata['format'])
+    return GlyphAtlas(display_format.convert(surface), metadata['widths'])
+
+
+def _write_atlas(atlas: GlyphAtlas) -> list[tuple[dict, bytes]]:
+    metadata = {'width': atlas.surface.get_width(), 'height': atlas.height, 'format': 'RGBA',
+                'widths': [atlas.areas[char].width for char in co.GLYPH_CHARACTERS]}
+    return [(metadata, pyg.image.tobytes(atlas.surface, 'RGBA'))]
@@ -1,13 +1,21 @@
 import pygame
 
+from asset_pack import load_image
+
 
 class Image:
     @staticmethod
-    def slice_by_columns(sprite_sheet: pygame.Surface, width: int) -> list[pygame.Surface]:
+    def slice_by_columns(sprite_sheet: pygame.Surface, width: int, views: bool = False) -> list[pygame.Surface]:
+        """If views is True, the sprites are subsurfaces sharing the pixels of the sprite sheet instead of copies."""
+
         height = sprite_sheet.get_height()
 
         sprites = list()
         for i in range(sprite_sheet.get_width() // width):
+            if views:
+                sprites.append(sprite_sheet.subsurface((i * width, 0, width, height)))
+                continue
+
             sprite = pygame.Surface((width, height), pygame.SRCALPHA)
             sprite.blit(
                 source=sprite_sheet,
@@ -19,11 +27,17 @@ class Image:
         return sprites
 
     @staticmethod
-    def slice_by_rows(sprite_sheet: pygame.Surface, height: int) -> list[pygame.Surface]:
+    def slice_by_rows(sprite_sheet: pygame.Surface, height: int, views: bool = False) -> list[pygame.Surface]:
+        """If views is True, the sprites are subsurfaces sharing the pixels of the sprite sheet instead of copies."""
+
         width = sprite_sheet.get_width()
 
         sprites = list()
         for i in range(sprite_sheet.get_height() // height):
+            if views:
+                sprites.append(sprite_sheet.subsurface((0, i * height, width, height)))
+                continue
+
             sprite = pygame.Surface((width, height), pygame.SRCALPHA)
             sprite.blit(
                 source=sprite_sheet,
@@ -35,8 +49,40 @@ class Image:
         return sprites
 
     @staticmethod
-    def slice_vertically_then_horizontally(filename: str, width: int, height: int) -> list[pygame.Surface]:
-        sprite_sheet = pygame.image.load(filename)
+    def slice_grid(sprite_sheet: pygame.Surface, width: int, height: int,
+                   column_major: bool = False) -> list[pygame.Surface]:
+        """
+        Slice the sprite sheet in a single pass, without allocating any surface:
+        the sprites are subsurfaces sharing the pixels of the sprite sheet.
+
+        Parameters
+        ----------
+        sprite_sheet : pygame.Surface
+            Surface to slice, kept alive by the sprites.
+        width : int
+            Width of a sprite.
+        height : int
+            Height of a sprite.
+        column_major : bool, optional
+            If True, the sprites are ordered column by column instead of row by row.
+        """
+
+        columns = sprite_sheet.get_width() // width
+        rows = sprite_sheet.get_height() // height
+        if column_major:
+            cells = ((column, row) for column in range(columns) for row in range(rows))
+        else:
+            cells = ((column, row) for row in range(rows) for column in range(columns))
+
+        return [sprite_sheet.subsurface((column * width, row * height, width, height)) for column, row in cells]
+
+    @staticmethod
+    def slice_vertically_then_horizontally(filename: str, width: int, height: int,
+                                           views: bool = False) -> list[pygame.Surface]:
+        sprite_sheet = load_image(filename)
+        if views:
+            return Image.slice_grid(sprite_sheet, width, height, column_major=True)
+
         sprites_rows = Image.slice_by_columns(sprite_sheet, height)
 
         sprites = list()
@@ -46,8 +92,12 @@ class Image:
         return sprites
 
     @staticmethod
-    def slice_horizontally_then_vertically(filename: str, width: int, height: int) -> list[pygame.Surface]:
-        sprite_sheet = pygame.image.load(filename)
+    def slice_horizontally_then_vertically(filename: str, width: int, height: int,
+                                           views: bool = False) -> list[pygame.Surface]:
+        sprite_sheet = load_image(filename)
+        if views:
+            return Image.slice_grid(sprite_sheet, width, height)
+
         sprites_rows = Image.slice_by_rows(sprite_sheet, height)
 
         sprites = list()
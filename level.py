@@ -3,6 +3,7 @@ import random
 
 import pygame as pyg
 
+import cascade_sound
 import constants as co
 import sounds
 import textures
@@ -11,7 +12,9 @@ from cell import Cell
 from circle import Circle
 from constants import CellType
 from levels import LevelData, get_level
-from sound_manager import SoundManager
+from render_queue import RenderQueue
+from scheduler import SCHEDULER
+from sound_manager import SoundManager, Voice
 from window import Scale
 
 
@@ -26,6 +29,9 @@ class LevelManager:
         self.all_level_complete = False
 
         self.gold_medals: dict[int, bool] = {n: False for n in range(co.LEVEL_COUNT)}
+        # Built in advance, so that loading them is instantaneous, each used only once
+        self.prefetched_levels: dict[int, Level] = dict()
+        SCHEDULER.defer(LevelManager.prefetch, co.LEVEL_PREFETCH_PRIORITY, co.LEVEL_PREFETCH_COST)
 
     @classmethod
     def instance(cls) -> 'LevelManager':
@@ -46,8 +52,8 @@ class LevelManager:
     def reload_current_level(self):
         self.load_level(self.number)
 
-    def __get_level(self):
-        level_data: LevelData = get_level(self.number)
+    def __get_level(self, number: int):
+        level_data: LevelData = get_level(number)
         return Level(
             level_data.number,
             level_data.cell_size,
@@ -56,9 +62,34 @@ class LevelManager:
             level_data.cells
         )
 
+    @classmethod
+    def prefetch(cls) -> bool:
+        """Prefetch a level of the current instance, see prefetch_level."""
+
+        return cls.instance().prefetch_level()
+
+    def prefetch_level(self) -> bool:
+        """
+        Build one of the levels which can be loaded next, the current one and the next one.
+        Returns True if one was built, False if they all were already.
+        """
+
+        for number in (self.number, self.number + 1):
+            if 0 <= number < co.LEVEL_COUNT and number not in self.prefetched_levels:
+                self.prefetched_levels[number] = self.__get_level(number)
+                return True
+        return False
+
     def load_level(self, number: int):
+        if self.current_level is not None:
+            self.current_level.stop_select_sounds()
         self.number = number
-        self.current_level = self.__get_level()
+        level = self.prefetched_levels.pop(number, None)
+        # Only the levels which can be loaded next are kept, see prefetch_level
+        self.prefetched_levels = {key: value for key, value in self.prefetched_levels.items()
+                                  if key in (number, number + 1)}
+        self.current_level = level if level is not None else self.__get_level(number)
+        SCHEDULER.defer(LevelManager.prefetch, co.LEVEL_PREFETCH_PRIORITY, co.LEVEL_PREFETCH_COST)
 
         self.current_level_ended = False
         self.current_level.start_loading_animation()
@@ -95,6 +126,8 @@ class Level:
         self.temp_selected_cells: list[Cell] = list()
         self.temp_multiplier: float = 1.0
         self.circumscribed_circle: Circle = Circle(self.width // 2, self.height // 2, 0)
+        # Blits of the cells and circles, its dirty rects are the areas drawn on the last frame
+        self.render_queue: RenderQueue = RenderQueue()
 
         self.max_circles_count = max_circles_count
         self.max_circles_count_upgrade = 0
@@ -236,8 +269,9 @@ class Level:
             cell.points += cell.get_points() * self.temp_multiplier
 
             points += cell.get_points()
-
-        self.circles.append(ValidatedCircle(self.temp_circle, self.temp_selected_cells, points * self.temp_multiplier))
+        v_circle = ValidatedCircle(self.temp_circle, self.temp_selected_cells, points * self.temp_multiplier)
+        self.__premix_select_sounds(v_circle)
+        self.circles.append(v_circle)
 
         max_dist = math.dist((self.width / 2, self.height / 2),
                              (self.temp_circle.x, self.temp_circle.y)) + self.temp_circle.radius
@@ -251,6 +285,27 @@ class Level:
         SoundManager.instance().stop_sound(sounds.GROWING_CIRCLE)
         SoundManager.instance().play_sound(sound)
 
+    @staticmethod
+    def __premix_select_sounds(v_circle: 'ValidatedCircle'):
+        """
+        Play at once the select sounds the cells of the circle will play at the end of their animations, mixed
+        together. The circle keeps the voice playing them, to stop it if it is removed.
+        """
+
+        sound_manager = SoundManager.instance()
+        if not sound_manager.options.premix_cascades:
+            return
+
+        sound = sound_manager.get_sound(sounds.CELL_SELECT)
+        cascade = None if sound is None else cascade_sound.get_cascade(sound, [cell.get_select_volume()
+                                                                               for cell in v_circle.contained_cells])
+        if cascade is None:
+            return
+
+        v_circle.set_select_voice(sound_manager.play_sound_now(sounds.CELL_SELECT_CASCADE, cascade))
+        for cell in v_circle.contained_cells:
+            cell.is_select_sound_premixed = True
+
     def destroy_temp_circle(self, sound: str = ""):
         if self.temp_circle is None:
             return
@@ -270,6 +325,8 @@ class Level:
         self.circles.remove(v_circle)
 
         cell_still_in_animation = 0
+        # The rest of its premixed sound would be the one of cells not selected anymore
+        v_circle.stop_select_sound()
         for k, cell in enumerate(v_circle.contained_cells):
             if cell.animation is None:
                 self.points -= cell.points
@@ -338,6 +395,13 @@ class Level:
         if self.is_finished():
             self.start_unloading_animation()
 
+        if self.animation == 1:
+            self.update_loading_animation(dt)
+        elif self.animation == -1:
+            self.update_unloading_animation(dt)
+
+        for cell in self.cells:
+            cell.update(dt)
         self.update_temp_circle(dt)
         self.countdown -= dt
 
@@ -345,6 +409,7 @@ class Level:
         if self.temp_circle is None:
             return
 
+        self.temp_circle.previous_radius = self.temp_circle.radius
         self.temp_circle.radius += self.radius_inc_speed * dt
 
         for cell in self.cells:
@@ -381,19 +446,30 @@ class Level:
         return (self.animation == 0 and self.cells_in_animation <= 0
                 and self.countdown <= 0 and self.points >= self.required_points[0])
 
-    def draw(self, surface: pyg.Surface, scale: Scale, dt: float, up_down: float):
+    def is_idle(self) -> bool:
+        """Returns True if nothing in the level is moving or about to change on its own."""
+
+        return (self.animation == 0 and self.temp_circle is None and self.cells_in_animation <= 0
+                and self.countdown <= 0 and not self.is_finished()
+                and all(cell.animation is None and cell.flying_text is None for cell in self.cells))
+
+    def draw(self, surface: pyg.Surface, scale: Scale, alpha: float, up_down: float):
+        """
+        Draw the level. alpha is the progress from the previous update to the next one, to interpolate the motions.
+        """
+
         if self.animation == 0:
             utils.draw_text_center(surface, f"Level {self.number + 1}", 140, scale.to_screen_rect(co.LEVEL_TITLE_RECT),
                                    co.MEDIUM_COLOR)
-            self.draw_level(surface, scale, dt, up_down)
+            self.draw_level(surface, scale, alpha, up_down)
         elif self.animation == 1:
             utils.draw_text_center(surface, f"Level {self.number + 1}", 140, scale.to_screen_rect(co.LEVEL_TITLE_RECT),
                                    co.MEDIUM_COLOR)
-            self.draw_loading_animation(surface, scale, dt)
+            self.draw_animated_cells(surface, scale, alpha)
         elif self.animation == -1:
-            self.draw_unloading_animation(surface, scale, dt)
+            self.draw_animated_cells(surface, scale, alpha)
 
-    def draw_level(self, surface: pyg.Surface, scale: Scale, dt: float, up_down: float):
+    def draw_level(self, surface: pyg.Surface, scale: Scale, alpha: float, up_down: float):
         utils.draw_text_next_to_img(surface,
                                     textures.CELL_TEXTURES[0][1][co.TEXTURE_INDEX_FROM_SIZE[64]].get_current_sprite(),
                                     scale.to_screen_pos(*co.LEVEL_POINTS_COUNT_POS), int(15 * scale.scale),
@@ -416,13 +492,17 @@ class Level:
                                    co.MEDIUM_COLOR, up_down=up_down)
 
         for cell in self.cells:
-            cell.draw(surface, self.x_offset, self.y_offset, scale, dt)
-
+            cell.draw(self.render_queue, self.x_offset, self.y_offset, scale, alpha)
         for v_circle in self.circles:
-            v_circle.circle.draw(surface, self.x_offset, self.y_offset, scale)
+            v_circle.circle.draw(surface, self.render_queue, self.x_offset, self.y_offset, scale)
+        self.render_queue.flush(surface)
 
         if self.temp_circle is not None:
-            self.temp_circle.draw(surface, self.x_offset, self.y_offset, scale)
+            # Its radius changes every frame, so its ring is only cached once it is validated. Until then it is
+            # drawn directly, unless it has the size of a cached ring
+            self.temp_circle.draw(surface, self.render_queue, self.x_offset, self.y_offset, scale, cache_ring=False,
+                                  alpha=alpha)
+            self.render_queue.flush(surface)
 
     # endregion
 
@@ -440,23 +520,24 @@ class Level:
 
         SoundManager.instance().play_sound(sounds.START_LEVEL)
 
-    def draw_loading_animation(self, surface: pyg.Surface, scale: Scale, dt: float):
+    def update_loading_animation(self, dt: float):
         placed_cells_count = 0
         for cell in self.cells:
             if cell.temp_rect is None:
                 continue
 
-            cell.draw(surface, self.x_offset, self.y_offset, scale, dt)
             if cell.is_in_place():
-                cell.temp_rect = cell.rect
+                cell.previous_temp_pos = cell.temp_rect.topleft
+                cell.temp_rect = pyg.FRect(cell.rect)
                 placed_cells_count += 1
             else:
-                cell.temp_rect.x += cell.velocity[0] * dt * 60
-                cell.temp_rect.y += cell.velocity[1] * dt * 60
+                cell.move_temp_rect(cell.velocity[0] * dt * 60, cell.velocity[1] * dt * 60)
 
         if placed_cells_count == len(self.cells):
             LevelManager.instance().on_level_loaded()
             self.animation = 0
+            for cell in self.cells:
+                cell.previous_temp_pos = None
 
     def start_unloading_animation(self):
         for cell in self.cells:
@@ -465,26 +546,31 @@ class Level:
             speed = random.random() * 10 + 40
             cell.velocity = (speed * dir_x, speed * dir_y)
         self.animation = -1
+        self.stop_select_sounds()
 
         SoundManager.instance().play_sound(sounds.END_LEVEL)
 
-    def draw_unloading_animation(self, surface: pyg.Surface, scale: Scale, dt: float):
+    def update_unloading_animation(self, dt: float):
         removed_cells_count = 0
         for cell in self.cells:
             if cell.temp_rect is None:
                 continue
 
-            cell.draw(surface, self.x_offset, self.y_offset, scale, dt)
             if cell.is_outside_screen(self.x_offset, self.y_offset):
                 cell.displayed = False
                 removed_cells_count += 1
             else:
-                cell.temp_rect.x += cell.velocity[0] * dt * 60
-                cell.temp_rect.y += cell.velocity[1] * dt * 60
+                cell.move_temp_rect(cell.velocity[0] * dt * 60, cell.velocity[1] * dt * 60)
 
         if removed_cells_count == len(self.cells):
             LevelManager.instance().on_level_unloaded()
 
+    def draw_animated_cells(self, surface: pyg.Surface, scale: Scale, alpha: float):
+        for cell in self.cells:
+            if cell.temp_rect is not None:
+                cell.draw(self.render_queue, self.x_offset, self.y_offset, scale, alpha)
+        self.render_queue.flush(surface)
+
     # endregion
 
     # region ===== OTHER =====
@@ -501,6 +587,10 @@ class Level:
     def got_gold_medal(self):
         return self.points >= self.required_points[-1]
 
+    def stop_select_sounds(self):
+        for v_circle in self.circles:
+            v_circle.stop_select_sound()
+
     # endregion
 
 
@@ -509,3 +599,16 @@ class ValidatedCircle:
         self.circle = circle
         self.contained_cells = contained_cells
         self.points = points
+        # Voice playing the premixed select sounds of the cells, and when it started playing them
+        self.select_voice: Voice | None = None
+        self.select_start_time: float = 0.0
+
+    def set_select_voice(self, voice: Voice | None):
+        self.select_voice = voice
+        if voice is not None:
+            self.select_start_time = voice.start_time
+
+    def stop_select_sound(self):
+        if self.select_voice is not None:
+            self.select_voice.stop_if_playing_since(self.select_start_time)
+            self.select_voice = None
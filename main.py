@@ -4,21 +4,22 @@ import pygame
 
 import constants as co
 from game import Game
+from sound_manager import SoundManager
 from window import Window
 
 
 async def main():
+    SoundManager.pre_init(co.BROWSER_MIXER_BUFFER_SIZE)
     pygame.init()
     pygame.display.init()
-    screen = Window.create(width=960, height=540, fullscreen=False, title='GMTK 2024', icon_path='resources/icon.ico')
+    screen = Window.create(width=960, height=540, fullscreen=False, title='GMTK 2024', icon_path='resources/icon.ico',
+                           resizable=True)
     scale = Window.get_scale(co.WIDTH, co.HEIGHT, screen=screen)
 
     game = Game(screen, scale, is_browser=True)
     game.start()
 
-    while not game.is_ended:
-        game.loop()
-        await asyncio.sleep(0)
+    await game.run()
 
     Window.close()
 
@@ -1,11 +1,15 @@
+import asyncio
+
 import pygame
 
 import constants as co
 from game import Game
+from sound_manager import SoundManager
 from window import Window
 
 
 def main():
+    SoundManager.pre_init(co.MIXER_BUFFER_SIZE)
     pygame.init()
     pygame.display.init()
     screen = Window.create(width=1920, height=1080, fullscreen=True, title='Squale', icon_path='resources/icon.ico')
@@ -14,8 +18,7 @@ def main():
     game = Game(screen, scale, is_browser=False)
     game.start()
 
-    while not game.is_ended:
-        game.loop()
+    asyncio.run(game.run())
 
     Window.close()
 
@@ -9,6 +9,12 @@ class Options:
         self.music_volume: int = 2
         self.sfx_volume: int = 2
         self.hold_to_grow: bool = True
+        self.render_scale: float = co.RENDER_SCALE_AUTO
+        # Hardware cursor, and mouse read again just before drawing, toggled with F9
+        self.low_latency_input: bool = False
+        self.refresh_rate: int = co.REFRESH_RATE_AUTO  # Target frame rate
+        # Select sounds of the cells of a circle mixed once when it is validated, if NumPy is available
+        self.premix_cascades: bool = True
         self.update_music_volume()
 
     def cycle_music_volume(self):
@@ -40,5 +46,9 @@ class Options:
         else:
             self.sfx_volume = co.MAX_VOLUME
 
+    def cycle_render_scale(self):
+        index = co.RENDER_SCALE_OPTIONS.index(self.render_scale)
+        self.render_scale = co.RENDER_SCALE_OPTIONS[(index + 1) % len(co.RENDER_SCALE_OPTIONS)]
+
     def get_sfx_volume(self):
         return self.sfx_volume / co.MAX_VOLUME
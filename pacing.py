@@ -0,0 +1,97 @@
+import time
+from collections import deque
+from typing import Callable
+
+import pygame as pyg
+
+import constants as co
+from profiling import PROFILER
+
+
+class FramePacer:
+    """
+    A class which starts the frames at a fixed rate, more regularly than pygame.time.Clock.tick.
+
+    The sleeps of the OS can last a few ms longer than asked, which makes some frames late. The pacer sleeps until a
+    bit before the start of the next frame, then spins until it. The spin lasts as long as the longest recent
+    oversleep, at most PACER_MAX_SPIN_TIME, which caps the CPU time it uses per frame.
+    """
+
+    def __init__(self, can_sleep: bool = True):
+        """
+        Parameters
+        ----------
+        can_sleep : bool, default = True
+            False if the thread must not be blocked, as in the browser: the pacer then relies on a Clock, and only
+            measures the frames.
+        """
+
+        self.can_sleep = can_sleep
+        self.clock = pyg.time.Clock()
+        self.deadline: float = time.perf_counter()  # Planned start of the current frame
+        self.frame_start: float = self.deadline
+        self.period: float = 0.0  # Of the current frame (s)
+        self.frame_durations: deque[float] = deque(maxlen=co.PACER_SAMPLE_COUNT)
+        self.oversleeps: deque[float] = deque(maxlen=co.PACER_SAMPLE_COUNT)
+
+    def tick(self, fps: float, sleep: Callable[[float], bool | None] = time.sleep) -> float:
+        """
+        Wait for the start of the next frame. Returns the time since the start of the previous one (ms).
+
+        Parameters
+        ----------
+        fps : float
+            Rate of the frames.
+        sleep : Callable, default = time.sleep
+            Function sleeping for a duration (s). If it returns True, it was interrupted and the frame starts right
+            away.
+        """
+
+        period = 1 / fps
+        self.period = period
+        self.deadline += period
+        if self.can_sleep:
+            is_interrupted = self.__wait(sleep)
+        else:
+            self.clock.tick(fps)
+            is_interrupted = False
+
+        now = time.perf_counter()
+        if is_interrupted:
+            self.deadline = now
+        else:
+            lateness = now - self.deadline
+            missed_frames = int(lateness / period)
+            PROFILER.add_pacing(lateness, missed_frames)
+            if missed_frames > 0:
+                # Starting again from now, rather than rushing the next frames to catch up
+                self.deadline = now
+
+        duration = now - self.frame_start
+        self.frame_start = now
+        self.frame_durations.append(duration)
+        return 1000 * duration
+
+    def __wait(self, sleep: Callable[[float], bool | None]) -> bool:
+        spin_time = min(co.PACER_MAX_SPIN_TIME, max(self.oversleeps, default=co.PACER_MAX_SPIN_TIME))
+        sleep_time = self.deadline - time.perf_counter() - spin_time
+        if sleep_time > 0:
+            sleep_start = time.perf_counter()
+            if sleep(sleep_time):
+                return True
+            self.oversleeps.append(max(0.0, time.perf_counter() - sleep_start - sleep_time))
+
+        while time.perf_counter() < self.deadline:
+            # Lets the other threads, like the asset loader, run meanwhile
+            time.sleep(0)
+        return False
+
+    def get_time_left(self) -> float:
+        """Returns the time left until the next frame, if it is at the same rate as the current one (s)."""
+
+        return self.deadline + self.period - time.perf_counter()
+
+    def get_fps(self) -> float:
+        if not self.frame_durations:
+            return 0.0
+        return len(self.frame_durations) / sum(self.frame_durations)
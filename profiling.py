@@ -0,0 +1,144 @@
+import time
+from collections import deque
+
+import pygame as pyg
+
+import constants as co
+import utils
+from scheduler import SCHEDULER
+from window import Scale
+
+
+class FrameProfiler:
+    """
+    A class which measures the frames and shows the measures in an overlay.
+
+    The latency from an input to the present of the frame showing it cannot be measured exactly, as the events have no
+    timestamp: an input was received between two polls, so its latency is between the time since the last poll and
+    the time since the previous one.
+    """
+
+    def __init__(self):
+        self.is_shown: bool = False
+        self.last_poll_time: float = time.perf_counter()
+        # Times between which the input used by the current frame was received, None if there was no input
+        self.input_window: tuple[float, float] | None = None
+        # Input to present latency of the last frames with an input, at least and at most (s)
+        self.latencies: deque[tuple[float, float]] = deque(maxlen=co.PROFILER_SAMPLE_COUNT)
+        # Process time of the last frames at the full frame rate (s)
+        self.frame_cpu_times: deque[float] = deque(maxlen=co.PROFILER_SAMPLE_COUNT)
+        self.is_throttled: bool = False
+        self.cpu_time_saved: float = 0.0  # Estimated, since the start (s)
+        # Lateness of the start of the last frames (s), and the count of frames missed because of it
+        self.pacing: deque[tuple[float, int]] = deque(maxlen=co.PROFILER_PACING_SAMPLE_COUNT)
+        self.lines: list[str] = list()  # Summary of the measures, updated by flush
+        self.flush_time: float = 0.0
+        self.is_flush_deferred: bool = False
+
+    def toggle(self):
+        self.is_shown = not self.is_shown
+        if self.is_shown:
+            self.flush()
+
+    def poll(self, has_input: bool):
+        """Should be called each time the inputs are read, with whether there was a new one."""
+
+        now = time.perf_counter()
+        if has_input:
+            self.input_window = (self.last_poll_time, now)
+        self.last_poll_time = now
+
+    def present(self):
+        """Should be called once the frame is presented."""
+
+        if self.input_window is not None:
+            now = time.perf_counter()
+            earliest, latest = self.input_window
+            self.latencies.append((now - latest, now - earliest))
+            self.input_window = None
+
+    def add_frame(self, cpu_time: float, duration: float, target_fps: int, is_throttled: bool):
+        """
+        Should be called once per frame, to count the CPU time saved by the idle throttling.
+
+        Parameters
+        ----------
+        cpu_time : float
+            Process time used by the frame (s).
+        duration : float
+            Real time since the previous frame (s).
+        target_fps : int
+            Frame rate when the game is not idle.
+        is_throttled : bool
+            Whether the frame was throttled because the game was idle.
+        """
+
+        self.is_throttled = is_throttled
+        is_flush_due = time.perf_counter() - self.flush_time >= co.PROFILER_FLUSH_INTERVAL
+        if self.is_shown and is_flush_due and not self.is_flush_deferred:
+            SCHEDULER.defer(self.flush, co.PROFILER_FLUSH_PRIORITY)
+            self.is_flush_deferred = True
+        if not is_throttled:
+            self.frame_cpu_times.append(cpu_time)
+        elif self.frame_cpu_times:
+            # The frame replaces the ones which would have been drawn at the target frame rate in the meantime
+            mean_cpu_time = sum(self.frame_cpu_times) / len(self.frame_cpu_times)
+            self.cpu_time_saved += max(0.0, duration * target_fps * mean_cpu_time - cpu_time)
+
+    def add_pacing(self, lateness: float, missed_frames: int):
+        """Should be called by the frame pacer once per frame it did not start early."""
+
+        self.pacing.append((lateness, missed_frames))
+
+    def get_pacing_lines(self) -> list[str]:
+        jitter_counts = [0] * (len(co.PROFILER_JITTER_BUCKETS) + 1)
+        missed_counts = [0, 0, 0]  # 1, 2, and 3 or more frames
+        for lateness, missed_frames in self.pacing:
+            if missed_frames > 0:
+                missed_counts[min(missed_frames, 3) - 1] += 1
+                continue
+            bucket = 0
+            while bucket < len(co.PROFILER_JITTER_BUCKETS) and 1000 * lateness >= co.PROFILER_JITTER_BUCKETS[bucket]:
+                bucket += 1
+            jitter_counts[bucket] += 1
+
+        jitter = ' '.join(f'<{bound:g}: {count}' for bound, count in zip(co.PROFILER_JITTER_BUCKETS, jitter_counts))
+        return [f'Jitter (ms) {jitter} more: {jitter_counts[-1]}',
+                f'Missed deadlines 1: {missed_counts[0]} 2: {missed_counts[1]} 3+: {missed_counts[2]}']
+
+    def get_lines(self) -> list[str]:
+        lines = list()
+        if self.latencies:
+            min_latency, max_latency = self.latencies[-1]
+            mean_latency = sum(latency for latency, _ in self.latencies) / len(self.latencies)
+            worst_latency = max(latency for _, latency in self.latencies)
+            lines.append(f'Input to present: {1000 * min_latency:.1f} - {1000 * max_latency:.1f} ms')
+            lines.append(f'mean {1000 * mean_latency:.1f} ms, at most {1000 * worst_latency:.1f} ms')
+        else:
+            lines.append('Input to present: no input')
+        lines.extend(self.get_pacing_lines())
+        lines.append(f'Deferred work: {len(SCHEDULER.deferred)} queued, oldest {SCHEDULER.get_deferred_time():.1f} s, '
+                     f'ran {1000 * SCHEDULER.deferred_run_time:.1f} ms')
+        lines.append(f'{"Idle" if self.is_throttled else "Active"}, CPU time saved: {self.cpu_time_saved:.1f} s')
+        return lines
+
+    def flush(self):
+        """Summarize the measures for the overlay, which does not need to be as often as they are taken."""
+
+        self.lines = self.get_lines()
+        self.flush_time = time.perf_counter()
+        self.is_flush_deferred = False
+
+    def draw(self, surface: pyg.Surface, scale: Scale):
+        if not self.is_shown:
+            return
+
+        lines = self.lines
+        # Anchored by its bottom left corner, above the credit
+        x, y = co.PROFILER_POS[0], co.PROFILER_POS[1] - len(lines) * co.PROFILER_LINE_HEIGHT
+        for line in lines:
+            utils.draw_text(surface, line, co.PROFILER_TEXT_SIZE, scale.to_screen_pos(x, y), co.DARK_COLOR)
+            y += co.PROFILER_LINE_HEIGHT
+
+
+PROFILER = FrameProfiler()
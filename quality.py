@@ -0,0 +1,70 @@
+import constants as co
+from constants import QualityStep
+
+
+class QualityGovernor:
+    """
+    A class which turns off costly effects when the frames take too long, and turns them back on once there is
+    headroom again. The effects are turned off in the order of QualityStep, and back on in the reverse order.
+    """
+
+    def __init__(self):
+        self.target_fps: int = 60
+        self.level: int = 0  # Number of steps turned off
+        self.frame_times: list[float] = list()
+        self.headroom_windows: int = 0  # Consecutive windows with enough headroom to turn a step back on
+
+    def is_enabled(self, step: QualityStep) -> bool:
+        return step >= self.level
+
+    def is_lowest(self) -> bool:
+        return self.level == len(QualityStep)
+
+    def reset(self):
+        """Forget the measured frames, for instance when the frames are not representative (loading, rescaling)."""
+
+        self.frame_times.clear()
+        self.headroom_windows = 0
+
+    def add_frame(self, frame_time: float, can_restore: bool = True) -> bool:
+        """
+        Add the time spent on a frame, without the time waiting for the next one.
+        Returns True if an effect was turned off or on.
+
+        Parameters
+        ----------
+        frame_time : float
+            Time spent on the frame (s).
+        can_restore : bool, default = True
+            If False, the effects are not turned back on even if there is headroom.
+        """
+
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < co.QUALITY_WINDOW * self.target_fps:
+            return False
+
+        mean_time = sum(self.frame_times) / len(self.frame_times)
+        self.frame_times.clear()
+        budget = 1 / self.target_fps
+
+        if mean_time > co.QUALITY_DOWN_LOAD * budget:
+            self.headroom_windows = 0
+            if not self.is_lowest():
+                self.level += 1
+                return True
+            return False
+
+        if mean_time >= co.QUALITY_UP_LOAD * budget:
+            self.headroom_windows = 0
+            return False
+
+        # Turning an effect back on needs more evidence than turning it off, so that the quality does not flicker
+        self.headroom_windows += 1
+        if can_restore and self.level > 0 and self.headroom_windows >= co.QUALITY_RESTORE_WINDOWS:
+            self.level -= 1
+            self.headroom_windows = 0
+            return True
+        return False
+
+
+GOVERNOR = QualityGovernor()
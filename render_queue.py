@@ -0,0 +1,38 @@
+import pygame
+
+
+class RenderQueue:
+    """
+    A class which collects blits and submits them with a single Surface.blits call per layer,
+    the layers being drawn in increasing order.
+    """
+
+    def __init__(self):
+        self.layers: dict[int, list[tuple]] = dict()
+
+    def add(self, source: pygame.Surface, dest: tuple[float, float], layer: int = 0, area: pygame.Rect | None = None):
+        """
+        Queue a blit of the source surface at the specified position.
+
+        Parameters
+        ----------
+        source : pygame.Surface
+            Surface to blit.
+        dest : tuple of float
+            Position of the top left corner of the source on the destination surface.
+        layer : int, default = 0
+            Blits of a layer are drawn above the ones of the lower layers, and in the order they were queued.
+        area : pygame.Rect, optional
+            Part of the source to blit, the whole source if None.
+        """
+
+        if layer not in self.layers:
+            self.layers[layer] = list()
+        self.layers[layer].append((source, dest) if area is None else (source, dest, area))
+
+    def flush(self, surface: pygame.Surface):
+        """Blit all the queued surfaces on the surface and empty the queue."""
+
+        for layer in sorted(self.layers):
+            surface.blits(self.layers[layer], doreturn=False)
+        self.layers.clear()
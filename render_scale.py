@@ -0,0 +1,47 @@
+import constants as co
+
+
+class AutoRenderScale:
+    """
+    A class which picks the render scale meeting the target frame rate, from the time spent on each frame.
+    """
+
+    def __init__(self, target_fps: int):
+        self.target_fps = target_fps
+        self.scale_index: int = 0  # Index into RENDER_SCALES
+        self.frame_times: list[float] = list()
+
+    def get_scale(self) -> float:
+        return co.RENDER_SCALES[self.scale_index]
+
+    def reset(self):
+        """Forget the measured frames, for instance when the frames are not representative (loading, rescaling)."""
+
+        self.frame_times.clear()
+
+    def add_frame(self, frame_time: float) -> bool:
+        """
+        Add the time spent on a frame, without the time waiting for the next one.
+        Returns True if the render scale changed.
+        """
+
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < co.RENDER_SCALE_WINDOW * self.target_fps:
+            return False
+
+        mean_time = sum(self.frame_times) / len(self.frame_times)
+        self.frame_times.clear()
+        budget = 1 / self.target_fps
+
+        if mean_time > co.RENDER_SCALE_DOWN_LOAD * budget and self.scale_index < len(co.RENDER_SCALES) - 1:
+            self.scale_index += 1
+            return True
+
+        if self.scale_index > 0:
+            # As if the whole frame time was spent on pixels, which overestimates it and keeps it from oscillating
+            predicted_time = mean_time * (co.RENDER_SCALES[self.scale_index - 1] / self.get_scale()) ** 2
+            if predicted_time < co.RENDER_SCALE_UP_LOAD * budget:
+                self.scale_index -= 1
+                return True
+
+        return False
@@ -0,0 +1,150 @@
+import asyncio
+import bisect
+import time
+from typing import Callable, Coroutine
+
+
+class TaskScheduler:
+    """
+    A class which runs cooperative asyncio tasks between the frames, each frame giving them a time slice.
+
+    The tasks call checkpoint between two pieces of work: it returns right away while the slice is not spent, and
+    waits for the slice of the next frame otherwise. Long jobs are spread over the frames this way, without blocking
+    the only thread of the browser. A task should not wait for anything else than the scheduler, as the frame
+    waits for it until the end of the slice.
+
+    Work which can wait, like warming up caches, is deferred instead: it only runs in the time left before the next
+    frame once everything else is done.
+    """
+
+    def __init__(self):
+        self.slice_end: float = 0.0
+        self.tasks: set[asyncio.Task] = set()
+        self.waiting_tasks: set[asyncio.Task] = set()  # Waiting for the next slice
+        self.next_slice_future: asyncio.Future | None = None
+
+        # Sorted by priority then order: (priority, order, cost, work, time it was deferred)
+        self.deferred: list[tuple[int, int, float, Callable[[], bool | None], float]] = list()
+        self.deferred_order: int = 0
+        self.deferred_run_time: float = 0.0  # Spent running deferred work after the last frame (s)
+
+    def start(self, coroutine: Coroutine) -> asyncio.Task:
+        """Start a task, it runs from the next slice."""
+
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def get_remaining_time(self) -> float:
+        """Returns the time left in the current slice (s)."""
+
+        return max(0.0, self.slice_end - time.perf_counter())
+
+    async def checkpoint(self):
+        """Let the other tasks run, and wait for the next slice if this one is spent."""
+
+        if time.perf_counter() < self.slice_end:
+            await asyncio.sleep(0)
+        else:
+            await self.next_slice()
+
+    async def next_slice(self):
+        """Wait for the slice of the next frame."""
+
+        if self.next_slice_future is None:
+            self.next_slice_future = asyncio.get_running_loop().create_future()
+
+        task = asyncio.current_task()
+        self.waiting_tasks.add(task)
+        try:
+            await self.next_slice_future
+        finally:
+            self.waiting_tasks.discard(task)
+
+    async def sleep(self, duration: float):
+        """Wait for the first slice at least duration (s) from now."""
+
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            await self.next_slice()
+
+    async def run_slice(self, duration: float):
+        """Let the tasks run for at most duration (s), or until they all wait for the next slice."""
+
+        self.slice_end = time.perf_counter() + duration
+        if self.next_slice_future is not None:
+            self.next_slice_future.set_result(None)
+            self.next_slice_future = None
+            # They have not run yet, but are not waiting anymore
+            self.waiting_tasks.clear()
+
+        while time.perf_counter() < self.slice_end and not self.waiting_tasks.issuperset(self.tasks):
+            await asyncio.sleep(0)
+
+    def defer(self, work: Callable[[], bool | None], priority: int = 0, cost: float = 0.0,
+              deferred_time: float | None = None):
+        """
+        Queue low-priority work, run in the time left at the end of the frames.
+
+        Parameters
+        ----------
+        work : Callable
+            Function doing the work. If it returns True, it has more to do and is queued again.
+        priority : int, default = 0
+            The work with the lowest priority runs first.
+        cost : float, default = 0.0
+            Estimated duration of the work (s), it is not started if there is less time left.
+        deferred_time : float, optional
+            When the work was first deferred, defaults to now.
+        """
+
+        if deferred_time is None:
+            deferred_time = time.perf_counter()
+        bisect.insort(self.deferred, (priority, self.deferred_order, cost, work, deferred_time),
+                      key=lambda item: item[:2])
+        self.deferred_order += 1
+
+    def run_deferred(self, duration: float):
+        """
+        Run the deferred work for at most duration (s), by priority. A piece of work is only started if its cost fits
+        in the time left, so the work which does not fit is preempted by the next frame.
+        """
+
+        start = time.perf_counter()
+        end = start + duration
+        index = 0
+        while index < len(self.deferred):
+            now = time.perf_counter()
+            if now >= end:
+                break
+
+            priority, _, cost, work, deferred_time = self.deferred[index]
+            if now + cost > end:
+                index += 1
+                continue
+
+            del self.deferred[index]
+            try:
+                is_unfinished = work() is True
+            except Exception:
+                # Deferred work is never needed for the game to go on, so it is dropped
+                is_unfinished = False
+            if is_unfinished:
+                self.defer(work, priority, cost, deferred_time)
+            index = 0
+        self.deferred_run_time = time.perf_counter() - start
+
+    def get_deferred_time(self) -> float:
+        """Returns how long the oldest deferred work has been waiting (s)."""
+
+        if not self.deferred:
+            return 0.0
+        return time.perf_counter() - min(item[4] for item in self.deferred)
+
+    def cancel_all(self):
+        for task in self.tasks:
+            task.cancel()
+
+
+SCHEDULER = TaskScheduler()
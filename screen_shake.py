@@ -2,15 +2,20 @@ import math
 import random
 
 import constants as co
+from constants import QualityStep
+from quality import GOVERNOR
 
 
 class ScreenShake:
     def __init__(self):
-        self.frame = 0
+        self.time: float = 0.0  # Since the start of the shake (s)
         self.values: list[tuple[int, int]] = list()
 
     def shake(self, intensity: int):
-        self.frame = 0
+        if not GOVERNOR.is_enabled(QualityStep.SCREEN_SHAKE):
+            return
+
+        self.time = 0.0
         self.values = list()
 
         intensity = min(co.SCREEN_SHAKE_MAX_INTENSITY, intensity)
@@ -23,11 +28,16 @@ class ScreenShake:
             value = math.sin(n * co.FREQUENCY) * intensity
             self.values.append((value * dir_x, value * dir_y))
 
-    def get_next(self) -> tuple[int, int]:
-        if self.frame < len(self.values):
-            value = self.values[self.frame]
-            self.frame += 1
-            return value
+    def update(self, dt: float):
+        self.time += dt
+
+    def is_shaking(self) -> bool:
+        return int(self.time * co.SCREEN_SHAKE_RATE) < len(self.values)
+
+    def get_offset(self) -> tuple[int, int]:
+        index = int(self.time * co.SCREEN_SHAKE_RATE)
+        if index < len(self.values):
+            return self.values[index]
 
         return 0, 0
 
@@ -0,0 +1,85 @@
+import hashlib
+
+import pygame.mixer as mixer
+
+import constants
+from asset_cache import hash_files, read_bundle_chunks, read_bundle_index, touch_bundle, write_bundle_in_background
+
+# Name of the single chunk of the bundle, holding the samples of all the sounds so that they are read at once
+SAMPLES_CHUNK = 'samples'
+
+
+class SoundBank:
+    """
+    Cache on disk of the sounds once decoded, as raw samples in the format of the mixer. The sounds are made from
+    the samples without decoding anything, and the samples of all of them are read from the disk at once.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path : str
+            Path of the bank. The mixer must be initialized, as the samples are in its format.
+        """
+
+        self.path = path
+        self.sources_hash = _get_sources_hash()
+        self.entries: dict[str, dict] = dict()  # Offset and length of the samples of the sounds, by name
+        self.data_position: int = 0
+        self.is_read: bool = False
+        self.samples: dict[str, bytes | memoryview] = dict()  # Read from the disk or saved, by name
+        self.new_samples: dict[str, bytes] = dict()
+
+    def load_index(self):
+        bundle = read_bundle_index(self.path, self.sources_hash)
+        if bundle is not None:
+            index, self.data_position = bundle
+            self.entries = {entry['name']: entry for entry in index.get(SAMPLES_CHUNK, list())}
+            touch_bundle(self.path)
+
+    def __contains__(self, sound_name: str) -> bool:
+        return sound_name in self.entries
+
+    def read(self, sound_names: list[str]) -> dict[str, mixer.Sound]:
+        """
+        Make the sounds from their samples on disk. Returns the sounds which could be read, the samples of the bank
+        being read on the first call. Can be called outside the main thread.
+        """
+
+        if not self.is_read and self.entries:
+            self.is_read = True
+            index = {SAMPLES_CHUNK: list(self.entries.values())}
+            chunks = read_bundle_chunks(self.path, self.data_position, index, [SAMPLES_CHUNK])
+            if chunks is not None:
+                samples = chunks[SAMPLES_CHUNK]
+                start = min(entry['offset'] for entry in self.entries.values())
+                self.samples.update({name: samples[entry['offset'] - start:entry['offset'] - start + entry['length']]
+                                     for name, entry in self.entries.items()})
+
+        # The sounds copy the samples
+        return {sound_name: mixer.Sound(buffer=self.samples[sound_name]) for sound_name in sound_names
+                if sound_name in self.samples}
+
+    def add(self, sound_name: str, sound: mixer.Sound):
+        """Copy the samples of the sound to be saved."""
+
+        self.new_samples[sound_name] = sound.get_raw()
+
+    def save(self):
+        """Write the bank with the new sounds, in the background."""
+
+        if not self.new_samples:
+            return
+
+        # The sounds already in the bank are written again with the new ones
+        self.read(list())
+        self.samples.update(self.new_samples)
+        self.new_samples = dict()
+        write_bundle_in_background(self.path, self.sources_hash,
+                                   {SAMPLES_CHUNK: [({'name': name}, data) for name, data in self.samples.items()]})
+
+
+def _get_sources_hash() -> bytes:
+    # The samples depend on the format of the mixer as well as the files
+    return hashlib.sha256(hash_files(constants.SOUNDS_FOLDER) + repr(mixer.get_init()).encode()).digest()
@@ -1,20 +1,75 @@
+import math
 import random
+import time
 
 import pygame.mixer as mixer
 
 import constants
+from asset_pack import load_sound, open_asset
 from options import Options
 
 
+class Voice:
+    """A channel of the mixer, and the sound it was last given to play."""
+
+    def __init__(self, channel: mixer.Channel):
+        self.channel = channel
+        self.sound_name: str | None = None
+        self.priority: int = 0
+        self.start_time: float = 0.0
+
+    def is_playing(self) -> bool:
+        return self.sound_name is not None and self.channel.get_busy()
+
+    def play(self, sound_name: str, sound: mixer.Sound, volume: float, priority: int):
+        self.channel.play(sound)
+        # On the channel, as the sound is shared with the other voices playing it
+        self.channel.set_volume(volume)
+        self.sound_name = sound_name
+        self.priority = priority
+        self.start_time = time.perf_counter()
+
+    def stop(self):
+        self.channel.stop()
+        self.sound_name = None
+
+    def stop_if_playing_since(self, start_time: float):
+        """Stop the voice if it still plays the sound started at this time, not one which stole it since."""
+
+        if self.start_time == start_time and self.is_playing():
+            self.stop()
+
+
 class SoundManager:
     INSTANCE = None
 
     def __init__(self):
         self.sounds: dict[str, mixer.Sound] = dict()
+        self.sound_files: dict[str, str] = dict()  # Sounds loaded on the first time they are played
         self.musics: dict[str, str] = dict()
+        # With the settings of pre_init, if pygame.init has not already initialized it
         mixer.init()
         self.options: Options = Options()
 
+        mixer.set_num_channels(constants.SOUND_CHANNEL_COUNT)
+        self.voices: list[Voice] = [Voice(mixer.Channel(k)) for k in range(constants.SOUND_CHANNEL_COUNT)]
+        self.voice_settings: dict[str, tuple[int, int]] = dict()  # Priority and maximum voices of the sounds
+        # Volumes the sounds were played at since the last update, they are played on the next one
+        self.triggers: dict[str, list[float]] = dict()
+
+    @staticmethod
+    def pre_init(buffer_size: int = constants.MIXER_BUFFER_SIZE) -> None:
+        """
+        Set the format and buffer of the mixer, should be called before pygame.init.
+
+        Parameters
+        ----------
+        buffer_size : int, default = MIXER_BUFFER_SIZE
+            Number of samples mixed at once, a power of two. The smaller, the sooner the sounds are heard.
+        """
+
+        mixer.pre_init(constants.MIXER_FREQUENCY, constants.MIXER_SAMPLE_SIZE, constants.MIXER_CHANNELS, buffer_size)
+
     @classmethod
     def instance(cls) -> 'SoundManager':
         if cls.INSTANCE is None:
@@ -22,31 +77,100 @@ class SoundManager:
         return cls.INSTANCE
 
     def add_sound(self, sound_path: str, sound_name: str) -> None:
-        sound = mixer.Sound(sound_path)
+        sound = load_sound(sound_path)
+        self.sounds[sound_name] = sound
+
+    def set_sound(self, sound: mixer.Sound, sound_name: str) -> None:
         self.sounds[sound_name] = sound
 
+    def register_sound(self, sound_path: str, sound_name: str) -> None:
+        self.sound_files[sound_name] = sound_path
+
+    def set_voice_settings(self, sound_name: str, priority: int, max_voices: int) -> None:
+        """
+        Set how the sound shares the voices.
+
+        Parameters
+        ----------
+        sound_name : str
+            Name of the sound.
+        priority : int
+            A sound can steal the voice of a sound with a lower or equal priority, if they are all playing.
+        max_voices : int
+            Maximum number of voices playing the sound at once, it steals its oldest one beyond.
+        """
+
+        self.voice_settings[sound_name] = (priority, max_voices)
+
+    def has_sound(self, sound_name: str) -> bool:
+        return sound_name in self.sounds
+
+    def get_sound(self, sound_name: str) -> mixer.Sound | None:
+        if sound_name not in self.sounds and sound_name in self.sound_files:
+            self.add_sound(self.sound_files[sound_name], sound_name)
+        return self.sounds.get(sound_name, None)
+
     def play_sound(self, sound_name: str, volume: float = 1.0) -> None:
-        sound = self.sounds.get(sound_name, None)
-        if sound is None:
+        """Play the sound on the next update, along with the other times it is played until then."""
+
+        if self.get_sound(sound_name) is None:
             return
 
+        if self.options.get_sfx_volume() > 0:
+            self.triggers.setdefault(sound_name, list()).append(volume)
+
+    def play_sound_now(self, sound_name: str, sound: mixer.Sound, volume: float = 1.0) -> Voice | None:
+        """
+        Play the sound right away, with the voice settings of the sound name, rather than on the next update. Returns
+        the voice playing it, so that it can be stopped alone, or None if it is not played.
+        """
+
         base_volume = self.options.get_sfx_volume()
-        if base_volume > 0:
-            sound.set_volume(base_volume * volume)
-            sound.play()
+        if base_volume <= 0:
+            return None
+        return self.__play_voice(sound_name, base_volume * volume, sound)
 
-    def stop_sound(self, sound_name):
-        sound = self.sounds.get(sound_name, None)
-        if sound is None:
-            return
+    def update(self) -> None:
+        """
+        Should be called once per frame. The sounds played since the last update are played once each, a sound played
+        several times being louder: the volumes of the triggers add up as uncorrelated sounds would, by their powers.
+        """
 
-        sound.stop()
+        triggers, self.triggers = self.triggers, dict()
+        base_volume = self.options.get_sfx_volume()
+        for sound_name, volumes in triggers.items():
+            volume = min(1.0, max(volumes) * math.sqrt(len(volumes)))
+            self.__play_voice(sound_name, base_volume * volume)
+
+    def __play_voice(self, sound_name: str, volume: float, sound: mixer.Sound | None = None) -> Voice | None:
+        priority, max_voices = self.voice_settings.get(sound_name, (constants.DEFAULT_SOUND_PRIORITY,
+                                                                    constants.DEFAULT_SOUND_MAX_VOICES))
+        playing_voices = [voice for voice in self.voices if voice.is_playing()]
+        same_voices = [voice for voice in playing_voices if voice.sound_name == sound_name]
+        if len(same_voices) >= max_voices:
+            voice = min(same_voices, key=lambda v: v.start_time)
+        elif len(playing_voices) < len(self.voices):
+            voice = next(voice for voice in self.voices if not voice.is_playing())
+        else:
+            stealable_voices = [voice for voice in playing_voices if voice.priority <= priority]
+            if not stealable_voices:
+                return None
+            voice = min(stealable_voices, key=lambda v: (v.priority, v.start_time))
+
+        voice.play(sound_name, self.sounds[sound_name] if sound is None else sound, volume, priority)
+        return voice
+
+    def stop_sound(self, sound_name):
+        self.triggers.pop(sound_name, None)
+        for voice in self.voices:
+            if voice.sound_name == sound_name:
+                voice.stop()
 
     def add_music(self, music_path: str, music_name: str) -> None:
         self.musics[music_name] = music_path
 
     def __play_music(self, music_path: str, loop: bool):
-        mixer.music.load(music_path)
+        mixer.music.load(open_asset(music_path), music_path)
         mixer.music.play(loops=-int(loop))
 
     def play_random_music(self, loop: bool = False):
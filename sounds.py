@@ -1,5 +1,11 @@
+from typing import Callable
+
 import pygame
 
+import constants
+from asset_loader import AssetLoader
+from asset_pack import load_sound, open_asset
+from sound_bank import SoundBank
 from sound_manager import SoundManager
 
 BUTTON_CLICK = "buttonClick"
@@ -15,40 +21,137 @@ END_LEVEL = "endLevel"
 BONUS_CIRCLE = "bonusCircle"
 EOL_ANIM_CLICK = "eolAnimClick"
 EOL_EARN_MEDAL = "eolEarnMedal"
+CELL_SELECT_CASCADE = "cellSelectCascade"  # CELL_SELECT of the cells of a circle mixed together, not a file
 
 MAX_MUSIC_VOLUME = 0.15
 
+MUSIC_FILE = "resources/audio/music.mp3"
+
+
+SOUND_FILES: dict[str, str] = {
+    BUTTON_CLICK: "resources/audio/sounds/btn_1.ogg",
+    CELL_SELECT: "resources/audio/sounds/cell_select_1.wav",
+    VALIDATE_CIRCLE_BLOCKER: "resources/audio/sounds/validate_circle_blocker_1.ogg",
+    VALIDATE_CIRCLE_CLICK: "resources/audio/sounds/validate_circle_1.ogg",
+    GROWING_CIRCLE: "resources/audio/sounds/growing_circle.wav",
+    NO_CIRCLE_LEFT: "resources/audio/sounds/no_circles_1.ogg",
+    DESTROY_CIRCLE: "resources/audio/sounds/destroy_circle_1.ogg",
+    START_LEVEL: "resources/audio/sounds/start_level_1.ogg",
+    END_LEVEL: "resources/audio/sounds/end_level_1.ogg",
+    BONUS_CIRCLE: "resources/audio/sounds/bonus_circle_1.ogg",
+    EOL_ANIM_CLICK: "resources/audio/sounds/eol_anim_click_1.ogg",
+    EOL_EARN_MEDAL: "resources/audio/sounds/earn_medal_1.ogg",
+}
+
+
+# Priority and maximum number of voices, DEFAULT_SOUND_PRIORITY and DEFAULT_SOUND_MAX_VOICES for the others
+SOUND_VOICES: dict[str, tuple[int, int]] = {
+    CELL_SELECT: (0, 4),  # Played by every cell of a circle, the least important
+    # Stopped with the circle they were played for, so they only steal each other when all the voices are playing
+    CELL_SELECT_CASCADE: (0, constants.SOUND_CHANNEL_COUNT),
+    GROWING_CIRCLE: (1, 1),
+    EOL_ANIM_CLICK: (1, 1),
+    START_LEVEL: (2, 1),
+    END_LEVEL: (2, 1),
+    EOL_EARN_MEDAL: (2, 1),
+}
+
+# Sounds which can be played by the first screen, loaded before it is shown
+PRELOADED_SOUNDS = (BUTTON_CLICK,)
+
+_bank: SoundBank | None = None
+
 
 def add_sound(filepath: str, sound_name: str):
     SoundManager.instance().add_sound(filepath, sound_name)
 
 
 def load_sounds():
-    add_sound("resources/audio/sounds/btn_1.ogg", BUTTON_CLICK)
+    for sound_name, filepath in SOUND_FILES.items():
+        add_sound(filepath, sound_name)
+
+
+def register_sounds():
+    """Register all the sounds, which are then loaded on the first time they are played."""
+
+    for sound_name, filepath in SOUND_FILES.items():
+        SoundManager.instance().register_sound(filepath, sound_name)
+    for sound_name, (priority, max_voices) in SOUND_VOICES.items():
+        SoundManager.instance().set_voice_settings(sound_name, priority, max_voices)
+
+
+def set_bank_path(path: str | None):
+    """
+    Set the file the decoded sounds are saved to and read from, or None to always decode them.
+    The mixer must be initialized beforehand.
+    """
+
+    global _bank
+
+    _bank = None
+    if path is not None:
+        _bank = SoundBank(path)
+        _bank.load_index()
+
+
+def queue_sounds(loader: AssetLoader, sound_names: tuple[str, ...] = tuple(SOUND_FILES)):
+    """
+    Add to the loader the jobs loading the sounds not loaded yet, from the sound bank if they are in it, by decoding
+    their files otherwise. The mixer must be initialized beforehand.
+    """
+
+    sound_names = [sound_name for sound_name in sound_names if not SoundManager.instance().has_sound(sound_name)]
+    banked_names = [sound_name for sound_name in sound_names if _bank is not None and sound_name in _bank]
+    if banked_names:
+        loader.add(_get_bank_reader(banked_names), _get_bank_setter(loader, banked_names))
+    for sound_name in sound_names:
+        if sound_name not in banked_names:
+            _queue_decoder(loader, sound_name)
+
+    if _bank is not None:
+        loader.add_finalizer(_bank.save)
+
+
+def _queue_decoder(loader: AssetLoader, sound_name: str):
+    loader.add(_get_sound_decoder(SOUND_FILES[sound_name]), _get_sound_setter(sound_name))
+
 
-    add_sound("resources/audio/sounds/cell_select_1.wav", CELL_SELECT)
+def _get_bank_reader(sound_names: list[str]) -> Callable[[], dict[str, pygame.mixer.Sound]]:
+    bank = _bank
+    return lambda: bank.read(sound_names)
 
-    add_sound("resources/audio/sounds/validate_circle_blocker_1.ogg", VALIDATE_CIRCLE_BLOCKER)
 
-    add_sound("resources/audio/sounds/validate_circle_1.ogg", VALIDATE_CIRCLE_CLICK)
+def _get_bank_setter(loader: AssetLoader, sound_names: list[str]) -> Callable[[dict[str, pygame.mixer.Sound]], None]:
+    def set_sounds(sounds: dict[str, pygame.mixer.Sound]):
+        for sound_name in sound_names:
+            if sound_name in sounds:
+                _set_sound(sounds[sound_name], sound_name)
+            else:
+                # The bank could not be read, the sound is decoded from its file and saved again
+                _queue_decoder(loader, sound_name)
 
-    add_sound("resources/audio/sounds/growing_circle.wav", GROWING_CIRCLE)
+    return set_sounds
 
-    add_sound("resources/audio/sounds/no_circles_1.ogg", NO_CIRCLE_LEFT)
 
-    add_sound("resources/audio/sounds/destroy_circle_1.ogg", DESTROY_CIRCLE)
+def _get_sound_decoder(filepath: str) -> Callable[[], pygame.mixer.Sound]:
+    return lambda: load_sound(filepath)
 
-    add_sound("resources/audio/sounds/start_level_1.ogg", START_LEVEL)
 
-    add_sound("resources/audio/sounds/end_level_1.ogg", END_LEVEL)
+def _get_sound_setter(sound_name: str) -> Callable[[pygame.mixer.Sound], None]:
+    def set_sound(sound: pygame.mixer.Sound):
+        if _bank is not None:
+            _bank.add(sound_name, sound)
+        _set_sound(sound, sound_name)
 
-    add_sound("resources/audio/sounds/bonus_circle_1.ogg", BONUS_CIRCLE)
+    return set_sound
 
-    add_sound("resources/audio/sounds/eol_anim_click_1.ogg", EOL_ANIM_CLICK)
 
-    add_sound("resources/audio/sounds/earn_medal_1.ogg", EOL_EARN_MEDAL)
+def _set_sound(sound: pygame.mixer.Sound, sound_name: str):
+    # It may have been loaded on the main thread by playing it in the meantime
+    if not SoundManager.instance().has_sound(sound_name):
+        SoundManager.instance().set_sound(sound, sound_name)
 
 
 def start_music():
-    pygame.mixer.music.load("resources/audio/music.mp3")
+    pygame.mixer.music.load(open_asset(MUSIC_FILE), MUSIC_FILE)
     pygame.mixer.music.play(loops=-1)
@@ -1,152 +1,630 @@
+import os
+import threading
+from typing import Callable
+
 import pygame as pyg
-from pygame.image import load
 from pygame.transform import scale_by
 
 import constants
+import display_format
 from animation_manager import Animation, AnimationManager
+from asset_cache import hash_files, prune_bundles, read_bundle_chunks, read_bundle_index, touch_bundle, write_bundle
+from asset_loader import AssetLoader
+from asset_pack import load_image
 from images import Image
 from window import Scale
 
-CELL_TEXTURES: list[list[list[Animation]]] = list()
-MODIFIERS_TEXTURES: list[list[Animation]] = list()
+# The textures are loaded on their first access (see __getattr__), or beforehand with queue or load_all
+CELL_TEXTURES: list[list[list[Animation]]]
+MODIFIERS_TEXTURES: list[list[Animation]]
 CELL_ANIMATOR = AnimationManager()
 
-BACKGROUND = load("resources/textures/background.png")
+BACKGROUND: pyg.Surface
+
+LOGO: pyg.Surface
+PLAY_BUTTON: pyg.Surface
+
+VOLUMES: list[pyg.Surface]
+CHECKBOXES: list[pyg.Surface]
+
+END_OF_LEVEL_BACKGROUND: pyg.Surface
+END_OF_LEVEL_TITLE: pyg.Surface
+MEDALS: list[pyg.Surface]
+RESTART_LEVEL_BUTTON: pyg.Surface
+NEXT_LEVEL_BUTTON: pyg.Surface
+RESTART_GAME_BUTTON: pyg.Surface
+REMOVE_CIRCLE: pyg.Surface
+GMTK_LOGO: pyg.Surface
+CIRCLE: pyg.Surface
+PREVIOUS_LEVEL_BUTTON: pyg.Surface
+BG_CELL: pyg.Surface
+CURSOR: pyg.Surface
+BROWSER_TEXT: pyg.Surface
+
+# Files of the textures above, lists of files are loaded as lists of surfaces
+TEXTURE_FILES: dict[str, str | list[str]] = {
+    'BACKGROUND': "resources/textures/background.png",
+    'LOGO': "resources/textures/main_menu/logo.png",
+    'PLAY_BUTTON': "resources/textures/main_menu/play_btn.png",
+    'VOLUMES': [
+        "resources/textures/sounds/0.png",
+        "resources/textures/sounds/1.png",
+        "resources/textures/sounds/2.png",
+        "resources/textures/sounds/3.png"
+    ],
+    'CHECKBOXES': [
+        "resources/textures/checkbox_0.png",
+        "resources/textures/checkbox_1.png"
+    ],
+    'END_OF_LEVEL_BACKGROUND': "resources/textures/eol/end_of_level_bg.png",
+    'END_OF_LEVEL_TITLE': "resources/textures/eol/end_of_level_title.png",
+    'MEDALS': [
+        "resources/textures/eol/empty_medal.png",
+        "resources/textures/eol/gold_medal.png",
+        "resources/textures/eol/silver_medal.png",
+        "resources/textures/eol/bronze_medal.png"
+    ],
+    'RESTART_LEVEL_BUTTON': "resources/textures/eol/eol_restart_level_btn.png",
+    'NEXT_LEVEL_BUTTON': "resources/textures/eol/eol_next_level_btn.png",
+    'RESTART_GAME_BUTTON': "resources/textures/restart_btn.png",
+    'REMOVE_CIRCLE': "resources/textures/remove_circle.png",
+    'GMTK_LOGO': "resources/textures/gmtk-logo.png",
+    'CIRCLE': "resources/textures/circle.png",
+    'PREVIOUS_LEVEL_BUTTON': "resources/textures/prev_level_btn.png",
+    'BG_CELL': "resources/textures/cells/bg_cell.png",
+    'CURSOR': "resources/textures/cursor.png",
+    'BROWSER_TEXT': "resources/textures/main_menu/browser_text.png",
+}
+# Textures drawn at their original size whatever the scale
+UNSCALED_TEXTURES = ('REMOVE_CIRCLE', 'CURSOR')
+
+CELLS_FOLDER = "resources/textures/cells"
+MODIFIERS_FOLDER = "resources/textures/cells/_modifiers"
+# Folders of the cell animations and their total duration, grouped as in CELL_TEXTURES
+CELL_ANIMATIONS: list[list[tuple[str, float]]] = [
+    [("base", 4), ("selected", 4)],
+    [("forbidden", 1.3)],
+    [("blocker", 1)]
+]
+# Folders of the modifier animations and their sizes, in the order of MODIFIERS_TEXTURES
+MODIFIER_ANIMATIONS: list[tuple[str, list[int]]] = [
+    ("mult_0", [64, 128]),
+    ("mult_2", [64, 128]),
+    ("mult_5", [64, 128]),
+    ("circle_1", [64, 128]),
+    ("circle_2", [64, 128]),
+    ("pacifier", [64])
+]
+ANIMATIONS = ('CELL_TEXTURES', 'MODIFIERS_TEXTURES')
+ALL_TEXTURES = tuple(TEXTURE_FILES) + ANIMATIONS
+
+# Textures needed by the first screen (main menu or browser click screen), loaded before it is shown
+PRELOADED_TEXTURES = ('BACKGROUND', 'LOGO', 'PLAY_BUTTON', 'VOLUMES', 'CHECKBOXES', 'GMTK_LOGO', 'BG_CELL', 'CURSOR',
+                      'BROWSER_TEXT')
+
+_scale: Scale | None = None
+_cache: 'TextureCache | None' = None
+_sprites: dict[str, list[pyg.Surface]] = dict()  # Sliced and scaled sprite sheets, by file name
+_queued: set[str] = set()  # Textures and sprite sheets with a job in a loader
+_scale_sets: dict[str, dict[str, list[pyg.Surface]]] = dict()  # Textures of the previous scales, by scale
+_rescale: 'TextureRescale | None' = None
+_generation: int = 0  # Incremented when the textures are swapped, to drop the jobs of the previous scale
+_sources_hash: bytes | None = None
+
+
+class TextureCache:
+    """Cache on disk of the textures once sliced and scaled, for a given resolution and scale."""
+
+    def __init__(self, resolution: tuple[int, int], scale: Scale):
+        self.path = os.path.join(constants.TEXTURE_CACHE_FOLDER,
+                                 f'{resolution[0]}x{resolution[1]}_{scale.scale:.4f}.cache')
+        self.sources_hash = _get_sources_hash()
+        self.index: dict[str, list[dict]] = dict()
+        self.data_position: int = 0
+        self.read_chunks: dict[str, memoryview] = dict()  # Kept alive by the surfaces using them
+        self.new_chunks: dict[str, list[tuple[dict, bytes]]] = dict()
+
+    def load_index(self):
+        bundle = read_bundle_index(self.path, self.sources_hash)
+        if bundle is not None:
+            self.index, self.data_position = bundle
+            touch_bundle(self.path)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def read(self, names: list[str]) -> bool:
+        """Read the pixels of the textures from the disk. Can be called outside the main thread."""
+
+        chunks = read_bundle_chunks(self.path, self.data_position, self.index, names)
+        if chunks is None:
+            return False
+
+        self.read_chunks.update(chunks)
+        return True
+
+    def get(self, name: str) -> list[pyg.Surface]:
+        """Returns the textures once their pixels are read."""
+
+        chunk = self.read_chunks[name]
+        chunk_start = min(entry['offset'] for entry in self.index[name])
+        textures = list()
+        for entry in self.index[name]:
+            start = entry['offset'] - chunk_start
+            # The surface uses the cache buffer directly, it is only converted if the display format changed
+            texture = pyg.image.frombuffer(chunk[start:start + entry['length']], (entry['width'], entry['height']),
+                                           entry['format'])
+            textures.append(display_format.convert(texture))
+        return textures
+
+    def add(self, name: str, textures: list[pyg.Surface]):
+        """Copy the pixels of the textures to be saved. They should already be converted if the display exists."""
+
+        display_pixel_format = display_format.get_pixel_format()
+        chunks = list()
+        for texture in textures:
+            if (display_pixel_format is not None and display_format.is_converted(texture)
+                    and texture.get_pitch() == 4 * texture.get_width()):
+                # The pixels are already in the right format, so the copy is a single memcpy
+                pixel_format = display_pixel_format
+                pixels = bytes(texture.get_view('1'))
+            else:
+                pixel_format = 'RGBA'
+                pixels = pyg.image.tobytes(texture, pixel_format)
+            chunks.append(({'width': texture.get_width(), 'height': texture.get_height(), 'format': pixel_format},
+                           pixels))
+        self.new_chunks[name] = chunks
+
+    def save(self):
+        if self.new_chunks:
+            # The file is written in the background, as it can be several hundreds of MB at high resolutions
+            threading.Thread(target=self.__write).start()
+
+    def __write(self):
+        old_names = [name for name in self.index if name not in self.new_chunks]
+        if not self.read([name for name in old_names if name not in self.read_chunks]):
+            old_names = list()
+
+        chunks: dict[str, list[tuple[dict, bytes | memoryview]]] = dict()
+        for name in old_names:
+            chunk_start = min(entry['offset'] for entry in self.index[name])
+            chunks[name] = [({'width': entry['width'], 'height': entry['height'], 'format': entry['format']},
+                             self.read_chunks[name][entry['offset'] - chunk_start:
+                                                    entry['offset'] - chunk_start + entry['length']])
+                            for entry in self.index[name]]
+        chunks.update(self.new_chunks)
+        write_bundle(self.path, self.sources_hash, chunks)
+        # Each window size has its own cache, only the last used ones are kept
+        prune_bundles(constants.TEXTURE_CACHE_FOLDER, constants.TEXTURE_CACHE_MAX_FILES)
+
+
+def _get_sources_hash() -> bytes:
+    global _sources_hash
+
+    if _sources_hash is None:
+        _sources_hash = hash_files(constants.TEXTURES_FOLDER)
+    return _sources_hash
+
+
+def __getattr__(name: str):
+    """Load the textures which are not loaded yet on their first access."""
+
+    if name in TEXTURE_FILES:
+        _set_loaded(name, _load_now(name))
+    elif name in ANIMATIONS:
+        for filename, _ in _get_sprite_sheets():
+            if filename not in _sprites:
+                _set_loaded(filename, _load_now(filename))
+        _load_animations()
+    else:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    return globals()[name]
+
+
+def setup(scale: Scale, resolution: tuple[int, int] | None = None):
+    """
+    Set how the textures are loaded. Should be called before accessing or queuing any texture.
+
+    Parameters
+    ----------
+    scale : Scale
+        Scale the textures are drawn at.
+    resolution : tuple of int, optional
+        Size of the screen. If given, the textures are read from and saved to a cache on disk for this resolution.
+    """
+
+    global _scale, _cache
+
+    _scale = scale
+    _cache = None
+    if resolution is not None:
+        _cache = TextureCache(resolution, scale)
+        _cache.load_index()
+
+
+def load_all(scale: Scale, resolution: tuple[int, int] | None = None):
+    """Load, slice and scale all the textures on the main thread. See setup for the parameters."""
+
+    setup(scale, resolution)
+    loader = AssetLoader(max_workers=0)
+    queue(loader, ALL_TEXTURES)
+    loader.finish_all()
+
+
+def queue(loader: AssetLoader, names: tuple[str, ...]):
+    """
+    Add to the loader the jobs loading, slicing and scaling the specified textures.
+    The textures are available once the loader is finished, or earlier by accessing them.
+
+    Parameters
+    ----------
+    loader : AssetLoader
+        Loader decoding the textures.
+    names : tuple of str
+        Names of the textures to load, among ALL_TEXTURES.
+    """
+
+    cached_names = list()
+    for name in _get_job_names(names):
+        if _is_loaded(name) or name in _queued:
+            continue
+
+        _queued.add(name)
+        if _cache is not None and name in _cache:
+            cached_names.append(name)
+        else:
+            _queue_decoding(loader, name)
+
+    if cached_names:
+        cache, generation = _cache, _generation
+        loader.add(lambda: cache.read(cached_names),
+                   lambda is_read: _on_cache_read(loader, cached_names, is_read, generation))
+
+    loader.add_finalizer(_on_queued_loaded)
+
+
+def rescale(loader: AssetLoader, scale: Scale, resolution: tuple[int, int] | None, on_swapped: Callable[[], None]):
+    """
+    Load the textures at another scale in the background, while the current ones stay in use.
+    Once they are all loaded, they replace the current ones at once and on_swapped is called.
+    A previous rescale which is not finished yet is abandoned.
+
+    Parameters
+    ----------
+    loader : AssetLoader
+        Loader decoding the textures.
+    scale : Scale
+        New scale of the textures.
+    resolution : tuple of int, optional
+        New size of the screen, for the cache on disk (see setup).
+    on_swapped : Callable
+        Function called on the main thread once the textures are replaced.
+    """
+
+    global _rescale
+
+    _rescale = None
+    if _get_scale_key(scale) == _get_scale_key(_scale):
+        on_swapped()
+        return
 
-LOGO = load("resources/textures/main_menu/logo.png")
-PLAY_BUTTON = load("resources/textures/main_menu/play_btn.png")
+    # The textures of a previous scale are kept in memory, so that going back to it is immediate
+    _rescale = TextureRescale(scale, resolution, _scale_sets.pop(_get_scale_key(scale), dict()))
+    _queue_rescale(loader, _rescale, on_swapped)
 
-VOLUMES: list[pyg.Surface] = [
-    load("resources/textures/sounds/0.png"),
-    load("resources/textures/sounds/1.png"),
-    load("resources/textures/sounds/2.png"),
-    load("resources/textures/sounds/3.png")
-]
 
-CHECKBOXES: list[pyg.Surface] = [
-    load("resources/textures/checkbox_0.png"),
-    load("resources/textures/checkbox_1.png")
-]
+class TextureRescale:
+    """Textures loaded at another scale in the background, which replace the current ones once complete."""
 
-END_OF_LEVEL_BACKGROUND = load("resources/textures/eol/end_of_level_bg.png")
-END_OF_LEVEL_TITLE = load("resources/textures/eol/end_of_level_title.png")
-MEDALS: list[pyg.Surface] = [
-    load("resources/textures/eol/empty_medal.png"),
-    load("resources/textures/eol/gold_medal.png"),
-    load("resources/textures/eol/silver_medal.png"),
-    load("resources/textures/eol/bronze_medal.png")
-]
-RESTART_LEVEL_BUTTON = load("resources/textures/eol/eol_restart_level_btn.png")
-NEXT_LEVEL_BUTTON = load("resources/textures/eol/eol_next_level_btn.png")
-RESTART_GAME_BUTTON = load("resources/textures/restart_btn.png")
-REMOVE_CIRCLE = load("resources/textures/remove_circle.png")
-GMTK_LOGO = load("resources/textures/gmtk-logo.png")
-CIRCLE = load("resources/textures/circle.png")
-PREVIOUS_LEVEL_BUTTON = load("resources/textures/prev_level_btn.png")
-BG_CELL = load("resources/textures/cells/bg_cell.png")
-CURSOR = load("resources/textures/cursor.png")
-BROWSER_TEXT = load("resources/textures/main_menu/browser_text.png")
+    def __init__(self, scale: Scale, resolution: tuple[int, int] | None, textures: dict[str, list[pyg.Surface]]):
+        self.scale = scale
+        self.cache: TextureCache | None = None
+        if resolution is not None:
+            self.cache = TextureCache(resolution, scale)
+            self.cache.load_index()
+
+        self.textures: dict[str, list[pyg.Surface]] = textures  # By name of texture or sprite sheet
+        self.queued: set[str] = set()
+
+    def queue(self, loader: AssetLoader, names: list[str]):
+        cached_names = list()
+        for name in names:
+            if name in self.textures or name in self.queued:
+                continue
+
+            self.queued.add(name)
+            if self.cache is not None and name in self.cache:
+                cached_names.append(name)
+            else:
+                self.__queue_decoding(loader, name)
+
+        if cached_names:
+            loader.add(lambda: self.cache.read(cached_names),
+                       lambda is_read: self.__on_cache_read(loader, cached_names, is_read))
+
+    def __queue_decoding(self, loader: AssetLoader, name: str):
+        def finish(textures: list[pyg.Surface]):
+            textures = [display_format.convert(texture) for texture in textures]
+            if self.cache is not None:
+                self.cache.add(name, textures)
+            self.__set_loaded(name, textures)
+
+        loader.add(_get_decoder(name, self.scale.scale), finish)
+
+    def __on_cache_read(self, loader: AssetLoader, names: list[str], is_read: bool):
+        for name in names:
+            if is_read:
+                self.__set_loaded(name, self.cache.get(name))
+            else:
+                self.__queue_decoding(loader, name)
+
+    def __set_loaded(self, name: str, textures: list[pyg.Surface]):
+        self.queued.discard(name)
+        self.textures[name] = textures
+
+    def is_complete(self) -> bool:
+        return not self.queued
+
+    def recover_failed(self) -> bool:
+        """
+        Scale the current textures instead of the queued ones, once the loader is finished: their jobs failed.
+        Returns False if one of them is not loaded at the current scale either.
+        """
+
+        for name in list(self.queued):
+            if not _is_loaded(name):
+                return False
+
+            ratio = 1.0 if name in UNSCALED_TEXTURES else self.scale.scale / _scale.scale
+            self.__set_loaded(name, [display_format.convert(scale_by(texture, ratio))
+                                     for texture in _get_loaded_textures(name)])
+        return True
+
+
+def _get_scale_key(scale: Scale) -> str:
+    return f'{scale.scale:.4f}'
 
 
-def load_scale(filename: str, scale: Scale) -> pyg.Surface:
-    if scale.scale == 1:
-        return load(filename)
-    return scale_by(load(filename), scale.scale)
+def _get_job_names(names: tuple[str, ...]) -> list[str]:
+    """Returns the names of the textures and sprite sheets to load for the specified names of ALL_TEXTURES."""
 
+    job_names = list()
+    for name in names:
+        if name in ANIMATIONS:
+            job_names.extend(filename for filename, _ in _get_sprite_sheets() if filename not in job_names)
+        elif name not in job_names:
+            job_names.append(name)
+    return job_names
 
-def scale_list(textures: list[pyg.Surface], scale: Scale) -> list[pyg.Surface]:
-    return [scale_by(texture, scale.scale) for texture in textures]
 
+def _get_used_names() -> list[str]:
+    """Returns the names of the textures and sprite sheets loaded or queued."""
 
-def load_all(scale: Scale):
-    _load_textures(scale)
-    _load_cell_animations(scale)
-    _load_modifiers_animations(scale)
+    return [name for name in _get_job_names(ALL_TEXTURES) if _is_loaded(name) or name in _queued]
 
 
-def _load_textures(scale: Scale):
-    global END_OF_LEVEL_BACKGROUND, END_OF_LEVEL_TITLE, MEDALS, NEXT_LEVEL_BUTTON, LOGO, PLAY_BUTTON, VOLUMES, CHECKBOXES
-    global RESTART_GAME_BUTTON, RESTART_LEVEL_BUTTON, BACKGROUND, GMTK_LOGO, CIRCLE, PREVIOUS_LEVEL_BUTTON, BG_CELL
-    global BROWSER_TEXT
+def _is_loaded(name: str) -> bool:
+    return name in globals() or name in _sprites
 
-    if abs(1 - scale.scale) <= 0.03:
+
+def _load_now(name: str) -> list[pyg.Surface]:
+    if _scale is None:
+        raise RuntimeError("textures.setup should be called before accessing the textures.")
+
+    if _cache is not None and name in _cache and (name in _cache.read_chunks or _cache.read([name])):
+        return _cache.get(name)
+
+    textures = [display_format.convert(texture) for texture in _get_decoder(name, _scale.scale)()]
+    if _cache is not None:
+        _cache.add(name, textures)
+    return textures
+
+
+def _queue_decoding(loader: AssetLoader, name: str):
+    generation = _generation
+
+    def finish(textures: list[pyg.Surface]):
+        # The textures were swapped for another scale in the meantime, they are already loaded at the new one
+        if generation != _generation:
+            return
+
+        _queued.discard(name)
+        # It may have been loaded on the main thread by accessing it in the meantime
+        if _is_loaded(name):
+            return
+
+        textures = [display_format.convert(texture) for texture in textures]
+        if _cache is not None:
+            _cache.add(name, textures)
+        _set_loaded(name, textures)
+
+    loader.add(_get_decoder(name, _scale.scale), finish)
+
+
+def _on_cache_read(loader: AssetLoader, names: list[str], is_read: bool, generation: int):
+    if generation != _generation:
         return
 
-    BACKGROUND = scale_by(BACKGROUND, scale.scale)
-    LOGO = scale_by(LOGO, scale.scale)
+    for name in names:
+        if not is_read:
+            _queue_decoding(loader, name)
+            continue
 
-    END_OF_LEVEL_BACKGROUND = scale_by(END_OF_LEVEL_BACKGROUND, scale.scale)
-    END_OF_LEVEL_TITLE = scale_by(END_OF_LEVEL_TITLE, scale.scale)
-    MEDALS = scale_list(MEDALS, scale)
-    RESTART_LEVEL_BUTTON = scale_by(RESTART_LEVEL_BUTTON, scale.scale)
-    NEXT_LEVEL_BUTTON = scale_by(NEXT_LEVEL_BUTTON, scale.scale)
-    RESTART_GAME_BUTTON = scale_by(RESTART_GAME_BUTTON, scale.scale)
+        _queued.discard(name)
+        if not _is_loaded(name):
+            _set_loaded(name, _cache.get(name))
 
-    PLAY_BUTTON = scale_by(PLAY_BUTTON, scale.scale)
-    VOLUMES = scale_list(VOLUMES, scale)
-    CHECKBOXES = scale_list(CHECKBOXES, scale)
-    GMTK_LOGO = scale_by(GMTK_LOGO, scale.scale)
-    CIRCLE = scale_by(CIRCLE, scale.scale)
-    PREVIOUS_LEVEL_BUTTON = scale_by(PREVIOUS_LEVEL_BUTTON, scale.scale)
-    BG_CELL = scale_by(BG_CELL, scale.scale)
-    BROWSER_TEXT = scale_by(BROWSER_TEXT, scale.scale)
 
+def _on_queued_loaded():
+    if 'CELL_TEXTURES' not in globals() and all(filename in _sprites for filename, _ in _get_sprite_sheets()):
+        _load_animations()
 
-def _get_animation(filename: str, width: int, height: int, total_duration: float, scale: Scale) -> Animation:
-    textures = Image.slice_horizontally_then_vertically(filename, width, height)
+    if _cache is not None and all(_is_loaded(name) for name in ALL_TEXTURES):
+        _cache.save()
+
+
+def _queue_rescale(loader: AssetLoader, texture_rescale: TextureRescale, on_swapped: Callable[[], None]):
+    texture_rescale.queue(loader, _get_used_names())
+    loader.add_finalizer(lambda: _on_rescale_loaded(loader, texture_rescale, on_swapped))
+
+
+def _on_rescale_loaded(loader: AssetLoader, texture_rescale: TextureRescale, on_swapped: Callable[[], None]):
+    global _rescale
+
+    if texture_rescale is not _rescale:
+        return
+
+    if not texture_rescale.recover_failed():
+        # Abandoned, the current textures stay in use
+        _rescale = None
+        return
+
+    # Textures may have been loaded at the current scale in the meantime, they are loaded at the new one first
+    if not texture_rescale.is_complete() or any(name not in texture_rescale.textures for name in _get_used_names()):
+        _queue_rescale(loader, texture_rescale, on_swapped)
+        return
+
+    _swap(texture_rescale)
+    on_swapped()
+
+
+def _swap(texture_rescale: TextureRescale):
+    global _scale, _cache, _rescale, _generation
+
+    _scale_sets[_get_scale_key(_scale)] = _get_all_loaded_textures()
+    while len(_scale_sets) > constants.KEPT_TEXTURE_SCALES:
+        del _scale_sets[next(iter(_scale_sets))]
+
+    for name, textures in texture_rescale.textures.items():
+        if name in _sprites:
+            # In place, so that the animations use the new sprites
+            _sprites[name][:] = textures
+        else:
+            _set_loaded(name, textures)
+
+    _scale, _cache = texture_rescale.scale, texture_rescale.cache
+    _rescale = None
+    _generation += 1
+    _queued.clear()
+    _on_queued_loaded()
+
+
+def _get_all_loaded_textures() -> dict[str, list[pyg.Surface]]:
+    return {name: _get_loaded_textures(name) for name in list(_sprites) + list(TEXTURE_FILES) if _is_loaded(name)}
+
+
+def _get_loaded_textures(name: str) -> list[pyg.Surface]:
+    """Returns the textures of a loaded texture name or sprite sheet file name."""
+
+    if name in _sprites:
+        return list(_sprites[name])
+    return list(globals()[name]) if isinstance(globals()[name], list) else [globals()[name]]
+
+
+def _load_texture(filename: str, scale: float, scaled: bool) -> pyg.Surface:
+    if not scaled or abs(1 - scale) <= 0.03:
+        return load_image(filename)
+    return scale_by(load_image(filename), scale)
+
+
+def _get_decoder(name: str, scale: float) -> Callable[[], list[pyg.Surface]]:
+    """Returns the function loading the texture or sprite sheet at the scale. Can be called outside the main thread."""
+
+    if name in TEXTURE_FILES:
+        return _get_texture_decoder(name, scale)
+    return _get_sprites_decoder(name, dict(_get_sprite_sheets())[name], scale)
+
+
+def _get_texture_decoder(name: str, scale: float) -> Callable[[], list[pyg.Surface]]:
+    filenames = TEXTURE_FILES[name]
+    if not isinstance(filenames, list):
+        filenames = [filenames]
+    scaled = name not in UNSCALED_TEXTURES
+    return lambda: [_load_texture(filename, scale, scaled) for filename in filenames]
+
+
+def _set_texture(name: str, textures: list[pyg.Surface]):
+    globals()[name] = textures if isinstance(TEXTURE_FILES[name], list) else textures[0]
+
+
+def _set_loaded(name: str, textures: list[pyg.Surface]):
+    """Set the textures of a texture name or of a sprite sheet file name."""
+
+    display_format.check_converted(textures, name)
+    if name in TEXTURE_FILES:
+        _set_texture(name, textures)
+    else:
+        _sprites[name] = textures
+
+
+def _get_sprite_sheets() -> list[tuple[str, int]]:
+    sprite_sheets = list()
+    for group in CELL_ANIMATIONS:
+        for folder, _ in group:
+            sprite_sheets.extend((f"{CELLS_FOLDER}/{folder}/{size}.png", size) for size in constants.TEXTURE_SIZES)
+    for folder, sizes in MODIFIER_ANIMATIONS:
+        sprite_sheets.extend((f"{MODIFIERS_FOLDER}/{folder}/{size}.png", size) for size in sizes)
+    return sprite_sheets
+
+
+def _get_sprites_decoder(filename: str, size: int, scale: float) -> Callable[[], list[pyg.Surface]]:
+    return lambda: [
+        scale_by(texture, scale)
+        for texture in Image.slice_horizontally_then_vertically(filename, size, size, views=True)
+    ]
+
+
+def _get_animation(textures: list[pyg.Surface], total_duration: float) -> Animation:
     count = len(textures)
     return Animation(
-        [scale_by(texture, scale.scale) for texture in textures],
+        textures,
         [total_duration / count] * count
     )
 
 
-def _get_all_animations(filename: str, total_duration: float, scale: Scale) -> list[Animation]:
-    return [
-        _get_animation(f"{filename}/{size}.png", size, size, total_duration, scale)
-        for size in constants.TEXTURE_SIZES
-    ]
-
-
-def _get_modifier_animation(filename: str, size: int, initial_duration: float, anim_duration: float, scale: Scale) -> Animation:
-    textures = Image.slice_horizontally_then_vertically(f"{filename}/{size}.png", size, size)
+def _get_modifier_animation(textures: list[pyg.Surface], initial_duration: float, anim_duration: float) -> Animation:
     count = len(textures)
     return Animation(
-        [scale_by(texture, scale.scale) for texture in textures],
+        textures,
         [initial_duration] + [anim_duration / (count - 1)] * (count - 1)
     )
 
 
-def _load_cell_animations(scale: Scale):
-    global CELL_TEXTURES, CELL_ANIMATOR
+def _load_animations():
+    global CELL_TEXTURES, MODIFIERS_TEXTURES
 
-    base_cell_animations = [
-        _get_all_animations("resources/textures/cells/base", 4, scale),
-        _get_all_animations("resources/textures/cells/selected", 4, scale)
-    ]
-    CELL_TEXTURES.append(base_cell_animations)
-    CELL_ANIMATOR.add_animationss(base_cell_animations)
+    CELL_TEXTURES = list()
+    for group in CELL_ANIMATIONS:
+        cell_animations = [
+            [_get_animation(_sprites[f"{CELLS_FOLDER}/{folder}/{size}.png"], duration)
+             for size in constants.TEXTURE_SIZES]
+            for folder, duration in group
+        ]
+        CELL_TEXTURES.append(cell_animations)
+        CELL_ANIMATOR.add_animationss(cell_animations)
+
+    MODIFIERS_TEXTURES = list()
+    for folder, sizes in MODIFIER_ANIMATIONS:
+        animations = [_get_modifier_animation(_sprites[f"{MODIFIERS_FOLDER}/{folder}/{size}.png"], 6, 0.5)
+                      for size in sizes]
+        MODIFIERS_TEXTURES.append(animations)
+        CELL_ANIMATOR.add_animations(animations)
 
-    forbidden_cell_animations = [_get_all_animations("resources/textures/cells/forbidden", 1.3, scale)]
-    CELL_TEXTURES.append(forbidden_cell_animations)
-    CELL_ANIMATOR.add_animations(*forbidden_cell_animations)
 
-    blocker_cell_animations = [_get_all_animations("resources/textures/cells/blocker", 1, scale)]
-    CELL_TEXTURES.append(blocker_cell_animations)
-    CELL_ANIMATOR.add_animations(*blocker_cell_animations)
+def _convert_loaded():
+    """Convert again the loaded textures, in place so that the animations use the new ones."""
 
+    for name in TEXTURE_FILES:
+        if name not in globals():
+            continue
+        if isinstance(globals()[name], list):
+            globals()[name][:] = [display_format.convert(texture) for texture in globals()[name]]
+        else:
+            globals()[name] = display_format.convert(globals()[name])
 
-def _load_modifiers_animations(scale: Scale):
-    global MODIFIERS_TEXTURES, CELL_ANIMATOR
+    for sprites in _sprites.values():
+        sprites[:] = [display_format.convert(sprite) for sprite in sprites]
 
-    for folder in ('mult_0', 'mult_2', 'mult_5', 'circle_1', 'circle_2'):
-        animations = [
-            _get_modifier_animation("resources/textures/cells/_modifiers/" + folder, 64, 6, 0.5, scale),
-            _get_modifier_animation("resources/textures/cells/_modifiers/" + folder, 128, 6, 0.5, scale)
-        ]
-        MODIFIERS_TEXTURES.append(animations)
-        CELL_ANIMATOR.add_animations(animations)
 
-    animations = [_get_modifier_animation("resources/textures/cells/_modifiers/pacifier", 64, 6, 0.5, scale)]
-    MODIFIERS_TEXTURES.append(animations)
-    CELL_ANIMATOR.add_animations(animations)
+display_format.add_listener(_convert_loaded)
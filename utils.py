@@ -1,18 +1,40 @@
+import io
+import math
+import weakref
+
 import pygame as pyg
 
 import constants as co
+import glyph_atlas
+from asset_pack import read_asset
+from glyph_atlas import GlyphAtlas
 
 FONT_CACHE: dict[int, pyg.font.Font] = dict()
+FONT_DATA: bytes | None = None  # Read once for all the sizes, each font reading it through its own BytesIO
 SCALE: float = 1.0
 
+# Scale of the pulsing buttons and vertical offset of the bobbing titles and medals, for each phase of their cycle
+PULSE_SCALES = [1 + co.PULSE_AMPLITUDE * math.sin(2 * math.pi * phase / co.PULSE_PHASE_COUNT)
+                for phase in range(co.PULSE_PHASE_COUNT)]
+BOB_OFFSETS = [co.BOB_AMPLITUDE * math.sin(2 * math.pi * phase / co.BOB_PHASE_COUNT)
+               for phase in range(co.BOB_PHASE_COUNT)]
+# Pre-baked frames of the pulse of each image, removed with the image (when the textures are rescaled). The frames
+# must not reference the image, which would then never be removed
+PULSE_FRAMES: weakref.WeakKeyDictionary[pyg.Surface, list[tuple[pyg.Surface | None, float, float]]] = \
+    weakref.WeakKeyDictionary()
+
 
 def get_font(size, bold=False, italic=False, underline=False):
+    global FONT_DATA
+
     size = int(round(size * SCALE, 0))
     if size in FONT_CACHE:
         font: pyg.font.Font = FONT_CACHE[size]
     else:
         try:
-            font = pyg.font.Font(co.FONT_PATH, size)
+            if FONT_DATA is None:
+                FONT_DATA = bytes(read_asset(co.FONT_PATH))
+            font = pyg.font.Font(io.BytesIO(FONT_DATA), size)
         except:
             font = pyg.font.SysFont("arial", size)
         FONT_CACHE[size] = font
@@ -23,9 +45,23 @@ def get_font(size, bold=False, italic=False, underline=False):
     return font
 
 
+def get_glyph_atlas(size: int, color: tuple[int, int, int]) -> GlyphAtlas:
+    return glyph_atlas.get_atlas(get_font(size), int(round(size * SCALE, 0)), color)
+
+
+def is_atlas_text(text: str, bold=False, italic=False, underline=False) -> bool:
+    """Returns True if the text can be drawn from a glyph atlas instead of being rendered by the font."""
+
+    return not (bold or italic or underline) and glyph_atlas.can_draw(text)
+
+
 def draw_text(screen: pyg.Surface, text: str, size: int, pos: tuple[float, float], color: tuple[int, int, int],
               bold=False,
               italic=False, underline=False):
+    if is_atlas_text(text, bold, italic, underline):
+        get_glyph_atlas(size, color).draw(screen, text, pos)
+        return
+
     font: pyg.font.Font = get_font(size, bold=bold, italic=italic, underline=underline)
     img = font.render(text, False, color)
     screen.blit(img, pos)
@@ -41,6 +77,12 @@ def draw_text_center(screen: pyg.Surface, text: str, size: int, rect: pyg.Rect,
 
 def draw_text_center_right(screen: pyg.Surface, text: str, size: int, rect: pyg.Rect,
                            color: tuple[int, int, int], bold=False, italic=False, underline=False):
+    if is_atlas_text(text, bold, italic, underline):
+        atlas = get_glyph_atlas(size, color)
+        atlas.draw(screen, text,
+                   (rect.right - atlas.get_width(text), rect.centery - atlas.height / 2 + size * co.FONT_Y_OFFSET))
+        return
+
     font: pyg.font.Font = get_font(size, bold=bold, italic=italic, underline=underline)
     img = font.render(text, False, color)
     screen.blit(img, (rect.right - img.get_width(), rect.centery - img.get_height() / 2 + size * co.FONT_Y_OFFSET))
@@ -60,16 +102,80 @@ def draw_text_next_to_img(screen: pyg.Surface, img: pyg.Surface, img_pos: tuple[
 def draw_text_and_img_centered(screen: pyg.Surface, img: pyg.Surface, text: str,
                                size: int, rect: pyg.Rect, gap: int, color: tuple[int, int, int],
                                bold=False, italic=False, underline=False):
-    font: pyg.font.Font = get_font(size, bold=bold, italic=italic, underline=underline)
-    text_surf = font.render(text, False, color)
-    dw = (rect.width - (img.get_width() + gap + text_surf.get_width())) / 2
-    screen.blit(text_surf,
-                (rect.left + dw, rect.top + (rect.height - text_surf.get_height()) / 2 + co.FONT_Y_OFFSET * size))
-    screen.blit(img, (rect.left + dw + text_surf.get_width() + gap, rect.top + (rect.height - img.get_width()) / 2))
+    if is_atlas_text(text, bold, italic, underline):
+        atlas = get_glyph_atlas(size, color)
+        text_width, text_height = atlas.get_size(text)
+        dw = (rect.width - (img.get_width() + gap + text_width)) / 2
+        atlas.draw(screen, text, (rect.left + dw, rect.top + (rect.height - text_height) / 2 + co.FONT_Y_OFFSET * size))
+    else:
+        font: pyg.font.Font = get_font(size, bold=bold, italic=italic, underline=underline)
+        text_surf = font.render(text, False, color)
+        text_width = text_surf.get_width()
+        dw = (rect.width - (img.get_width() + gap + text_width)) / 2
+        screen.blit(text_surf,
+                    (rect.left + dw, rect.top + (rect.height - text_surf.get_height()) / 2 + co.FONT_Y_OFFSET * size))
+    screen.blit(img, (rect.left + dw + text_width + gap, rect.top + (rect.height - img.get_width()) / 2))
 
 
 def blit_scaled(screen: pyg.Surface, img: pyg.Surface, x: float, y: float, scale: float):
+    if scale == 1.0:
+        screen.blit(img, (x, y))
+        return
+
     scaled_img = pyg.transform.scale_by(img, scale)
     dx = (scaled_img.get_width() - img.get_width()) / 2
     dy = (scaled_img.get_height() - img.get_height()) / 2
     screen.blit(scaled_img, (x - dx, y - dy))
+
+
+def lerp(start: float, end: float, t: float) -> float:
+    return start + (end - start) * t
+
+
+def get_phase(time: float, speed: float, phase_count: int) -> int:
+    """
+    Returns the phase of a periodic animation at the specified time.
+
+    Parameters
+    ----------
+    time : float
+        Time since the start of the animation (s).
+    speed : float
+        Angular speed of the animation (rad/s).
+    phase_count : int
+        Number of phases in a cycle.
+    """
+
+    return int(time * speed / (2 * math.pi) * phase_count) % phase_count
+
+
+def get_pulse_frames(img: pyg.Surface) -> list[tuple[pyg.Surface | None, float, float]]:
+    """
+    Returns for each phase of the pulse the image scaled by PULSE_SCALES and the offset of its top left corner, so
+    that it stays centered. They are scaled once, and the phases giving the same size share their surface. The
+    surface is None for the phases giving the size of the image, which is drawn as is.
+    """
+
+    if img not in PULSE_FRAMES:
+        frames_by_size: dict[tuple[int, int], tuple[pyg.Surface, float, float]] = dict()
+        frames = list()
+        for scale in PULSE_SCALES:
+            size = (round(img.get_width() * scale), round(img.get_height() * scale))
+            if size not in frames_by_size:
+                scaled_img = None if size == img.get_size() else pyg.transform.scale(img, size)
+                frames_by_size[size] = (scaled_img, (size[0] - img.get_width()) / 2, (size[1] - img.get_height()) / 2)
+            frames.append(frames_by_size[size])
+        PULSE_FRAMES[img] = frames
+
+    return PULSE_FRAMES[img]
+
+
+def blit_pulsing(screen: pyg.Surface, img: pyg.Surface, x: float, y: float, phase: int | None):
+    """Blit the frame of the pulse of the image at the phase, or the image itself if the phase is None."""
+
+    if phase is None:
+        screen.blit(img, (x, y))
+        return
+
+    scaled_img, dx, dy = get_pulse_frames(img)[phase]
+    screen.blit(img if scaled_img is None else scaled_img, (x - dx, y - dy))
@@ -1,7 +1,9 @@
 import pygame
 from pygame import Rect
 
+import display_format
 import images
+from asset_pack import load_image
 
 
 class Scale:
@@ -77,7 +79,7 @@ class Window:
 
     @staticmethod
     def create(width: int = 0, height: int = 0, fullscreen: bool = False, title: str = "",
-               icon_path: str = "") -> pygame.Surface | pygame.SurfaceType:
+               icon_path: str = "", resizable: bool = False) -> pygame.Surface | pygame.SurfaceType:
         """
         Open a Pygame window with the specified width, height, title and icon.
 
@@ -91,23 +93,36 @@ class Window:
             Title of the window.
         icon_path : str, optional
             Path of the icon image.
+        resizable : bool, optional
+            If true, the window can be resized when not in fullscreen (see the 'VIDEORESIZE' event).
         """
 
         pygame.init()
-        if fullscreen:
-            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        else:
-            screen = pygame.display.set_mode((width, height))
+        screen = Window.set_mode(width, height, fullscreen, resizable)
 
         if title != "":
             pygame.display.set_caption(title)
 
         if icon_path != "":
-            icon = pygame.image.load(icon_path)
+            icon = load_image(icon_path)
             pygame.display.set_icon(icon)
 
         return screen
 
+    @staticmethod
+    def set_mode(width: int = 0, height: int = 0, fullscreen: bool = False,
+                 resizable: bool = False) -> pygame.Surface | pygame.SurfaceType:
+        """Change the size and mode of the window. See Window.create for the parameters."""
+
+        if fullscreen:
+            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            screen = pygame.display.set_mode((width, height), pygame.RESIZABLE if resizable else 0)
+        # The loaded surfaces are converted again if the pixel format of the new display is different
+        display_format.update()
+
+        return screen
+
     @staticmethod
     def close() -> None:
         """Premade function which closes Pygame."""